@@ -0,0 +1,99 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+
+from aoc2020 import batch, inputs, instrument
+from aoc2020.runner import format_json, format_table, parse_days, run_days
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc2020")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="solve several days in a process pool")
+    run_parser.add_argument("--days", default="1-22", help="days to solve (e.g. 1-5,7)")
+    run_parser.add_argument("--jobs", "-j", type=int, default=None, help="worker count")
+    run_parser.add_argument("--cache", action="store_true", help="use the result cache")
+    run_parser.add_argument(
+        "--format", choices=["table", "json"], default="table", help="report format"
+    )
+    run_parser.add_argument(
+        "--instrument",
+        metavar="MODES",
+        default=None,
+        help="instrument the solvers, comma separated modes among "
+        + ", ".join(instrument.MODES),
+    )
+
+    store_parser = subparsers.add_parser("store", help="add a puzzle input to the input store")
+    store_parser.add_argument("day", type=int, help="puzzle day")
+    store_parser.add_argument("path", help="input file ('-' for stdin)")
+    store_parser.add_argument("--user", default=None, help="user owning the input")
+
+    batch_parser = subparsers.add_parser("batch", help="solve one day for many input files")
+    batch_parser.add_argument("day", type=int, help="puzzle day")
+    batch_parser.add_argument("paths", nargs="+", help="input files")
+    batch_parser.add_argument(
+        "--part", type=int, choices=[1, 2], default=1, help="puzzle part"
+    )
+    batch_parser.add_argument("--jobs", "-j", type=int, default=None, help="worker count")
+    batch_parser.add_argument("--cache", action="store_true", help="use the result cache")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        days = parse_days(args.days)
+        if args.instrument:
+            # read by the worker processes when they import the solvers
+            os.environ["AOC2020_INSTRUMENT"] = args.instrument
+            instrument.modes()
+            reports = [
+                instrument.report_dir() / f"day{day}_part{part}.json"
+                for day in days
+                for part in (1, 2)
+            ]
+            for path in reports:
+                if path.exists():
+                    path.unlink()
+
+        start = time.perf_counter()
+        # answers looked up in the cache are not solved, so there is nothing to instrument
+        results = run_days(days, args.jobs, use_cache=args.cache and not args.instrument)
+        wall_time = time.perf_counter() - start
+
+        if args.format == "json":
+            print(format_json(results, wall_time))
+        else:
+            print(format_table(results))
+            print(f"total wall time: {wall_time:.3f}s")
+
+        if args.instrument:
+            totals = instrument.aggregate([path for path in reports if path.exists()])
+            print(instrument.format_aggregate(totals), file=sys.stderr)
+
+        return 1 if any(res.error is not None for res in results) else 0
+    elif args.command == "batch":
+        paths = [pathlib.Path(path) for path in args.paths]
+        failed = False
+        answers = batch.solve_many(args.day, args.part, paths, args.jobs, use_cache=args.cache)
+        for path, res in zip(paths, answers):
+            failed = failed or res.error is not None
+            answer = res.answer if res.error is None else f"ERROR: {res.error}"
+            print(f"{path}: {answer}")
+        return 1 if failed else 0
+    elif args.command == "store":
+        if args.path == "-":
+            data = sys.stdin.read()
+        else:
+            with open(args.path) as fp:
+                data = fp.read()
+        digest = inputs.put_data(data.rstrip("\n"), args.day, user=args.user)
+        print(f"day {args.day}: {digest}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
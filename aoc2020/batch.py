@@ -0,0 +1,73 @@
+"""Solve one day for many puzzle inputs.
+
+``solve_many`` fans the inputs out over a pool of worker processes which import the day's
+module once, so that module level constants (compiled regexes, ``day20.MONSTER``, ...) are
+built once per worker and numba kernels are compiled, or loaded from their cache, once per
+worker by the module's ``warmup()``. Results are streamed back in input order, and at most
+``max_in_flight`` inputs are submitted to the pool at a time so that memory stays bounded
+however many inputs there are.
+"""
+
+import concurrent.futures
+import importlib
+import os
+import pathlib
+from typing import Iterable, Iterator, Optional, Union
+
+from aoc2020.pool import bounded_map
+from aoc2020.runner import PartResult, solve_part
+
+# an input is either the puzzle input itself or the path of a file holding it
+Input = Union[str, os.PathLike]
+
+
+def _init_worker(day: int) -> None:
+    module = importlib.import_module(f"aoc2020.day{day}")
+    warmup = getattr(module, "warmup", None)
+    if warmup is not None:
+        warmup()
+
+
+def _solve(item: Input, day: int, part: int, use_cache: bool) -> PartResult:
+    if isinstance(item, os.PathLike):
+        item = pathlib.Path(item).read_text().rstrip("\n")
+    return solve_part(day, part, item, use_cache)
+
+
+def solve_many(
+    day: int,
+    part: int,
+    items: Iterable[Input],
+    jobs: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    use_cache: bool = False,
+) -> Iterator[PartResult]:
+    """Solve one part of one day for each input, yielding results in input order.
+
+    With ``jobs=0`` the inputs are solved in the current process. With ``use_cache`` answers
+    are looked up in, and stored to, the result cache.
+    """
+    if jobs == 0:
+        _init_worker(day)
+        for item in items:
+            yield _solve(item, day, part, use_cache)
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * jobs
+
+    with concurrent.futures.ProcessPoolExecutor(
+        jobs, initializer=_init_worker, initargs=(day,)
+    ) as pool:
+        yield from bounded_map(pool, _solve, items, max_in_flight, day, part, use_cache)
+
+
+def test_solve_many(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1721\n979\n366\n299\n675\n1456\n")
+    items = ["1721\n979\n366\n299\n675\n1456", path, "not a number"] * 3
+
+    for jobs in (0, 2):
+        results = list(solve_many(1, 1, items, jobs=jobs, max_in_flight=2))
+        assert [res.answer for res in results] == ["514579", "514579", None] * 3
+        assert results[2].error.startswith("ValueError")
@@ -0,0 +1,155 @@
+"""Benchmarks of every solver and variant over a ladder of generated input sizes.
+
+Benchmarks are skipped by plain ``pytest`` runs. Sizes can be scaled up with the
+``AOC2020_BENCH_SCALE`` environment variable. To store a baseline and later fail on
+regressions past the ``benchmark_compare_fail`` thresholds of ``pyproject.toml``:
+
+    pytest aoc2020/benchmarks.py --benchmark-only --benchmark-autosave
+    pytest aoc2020/benchmarks.py --benchmark-only --benchmark-compare
+"""
+
+import functools
+import importlib
+import operator
+import os
+import sys
+from typing import Any, List, NamedTuple, Sequence
+
+import pytest
+
+from aoc2020 import generators
+from aoc2020.runner import SOLVERS, Solver
+
+SCALE = float(os.environ.get("AOC2020_BENCH_SCALE", "1"))
+
+# generators which cannot produce inputs past a given size
+MAX_SIZES = {5: generators.MAX_DAY5_SIZE, 20: generators.MAX_DAY20_SIZE}
+
+
+class Benchmark(NamedTuple):
+    day: int
+    part: int
+    name: str
+    solver: Solver
+    sizes: Sequence[int]
+
+
+def _bus_list(data: str) -> str:
+    return data.split("\n")[1]
+
+
+def _max_n(data: str) -> int:
+    bus_ids = [int(x) for x in _bus_list(data).split(",") if x != "x"]
+    return functools.reduce(operator.mul, bus_ids) * max(bus_ids)
+
+
+def _day13_brute_force(variant: str) -> Solver:
+    return lambda m, d: getattr(m, variant)(_bus_list(d), _max_n(d))
+
+
+def _day15_rank(rank: int) -> Solver:
+    return lambda m, d: m.day15_part1(d, rank)
+
+
+LADDERS = {
+    1: (100, 10000, 100000),
+    2: (100, 1000, 10000),
+    3: (100, 1000, 10000),
+    4: (100, 1000, 10000),
+    5: (100, 500, 1000),
+    6: (100, 1000, 10000),
+    7: (100, 1000, 10000),
+    8: (100, 300, 1000),
+    9: (100, 500, 2000),
+    10: (100, 1000, 10000),
+    11: (10, 20, 40),
+    12: (100, 1000, 10000),
+    13: (4, 8, 16),
+    14: (20, 100, 500),
+    16: (50, 200, 1000),
+    17: (3, 5, 8),
+    18: (50, 200, 1000),
+    19: (50, 200, 1000),
+    20: (3, 6, 12),
+    21: (20, 50, 100),
+    22: (5, 10, 25),
+}
+
+
+def _benchmarks() -> List[Benchmark]:
+    # the solvers of the runner are prefixed, the variants they call have their own entries
+    out = []
+    for day, sizes in LADDERS.items():
+        for part, solver in enumerate(SOLVERS[day], start=1):
+            out.append(Benchmark(day, part, f"runner_day{day}_part{part}", solver, sizes))
+
+    # day 15 part 2 is a single large rank, benchmark a ladder of ranks instead
+    out.append(Benchmark(15, 1, "runner_day15_part1", SOLVERS[15][0], (3, 6, 12)))
+    for rank in (20200, 202000):
+        out.append(Benchmark(15, 2, f"day15_rank{rank}", _day15_rank(rank), (6,)))
+
+    out += [
+        Benchmark(6, 2, "day6_part2_v2", lambda m, d: m.day6_part2_v2(d), LADDERS[6]),
+        Benchmark(13, 2, "day13_part2", _day13_brute_force("day13_part2"), (2, 3)),
+        Benchmark(13, 2, "day13_part2_v2", _day13_brute_force("day13_part2_v2"), (2, 3, 4)),
+        Benchmark(13, 2, "day13_part2_v3", _day13_brute_force("day13_part2_v3"), (2, 4, 6)),
+        Benchmark(13, 2, "day13_part2_v4", _day13_brute_force("day13_part2_v4"), (2, 4, 6)),
+        Benchmark(
+            17,
+            1,
+            "day17_pure_python_u_leijurv",
+            lambda m, d: m.day17_pure_python_u_leijurv(d, 3),
+            LADDERS[17],
+        ),
+        Benchmark(
+            17,
+            2,
+            "day17_pure_python_u_leijurv",
+            lambda m, d: m.day17_pure_python_u_leijurv(d, 4),
+            LADDERS[17],
+        ),
+        Benchmark(
+            17,
+            2,
+            "day17_part2_scipy_u_wimglenn",
+            lambda m, d: m.day17_part2_scipy_u_wimglenn(d),
+            LADDERS[17],
+        ),
+        Benchmark(19, 1, "day19_part1_v2", lambda m, d: m.day19_part1_v2(d), LADDERS[19]),
+        Benchmark(19, 2, "day19_part2_v2", lambda m, d: m.day19_part2_v2(d), LADDERS[19]),
+    ]
+    return out
+
+
+BENCHMARKS = _benchmarks()
+
+
+def _scaled(day: int, size: int) -> int:
+    return min(int(size * SCALE), MAX_SIZES.get(day, sys.maxsize))
+
+
+@functools.lru_cache(maxsize=None)
+def bench_input(day: int, size: int) -> str:
+    return generators.generate(day, size)
+
+
+def _params() -> List[Any]:
+    params = []
+    for bench in BENCHMARKS:
+        # scaled sizes past the generator's limit are clamped to it, benchmark it once
+        for size in sorted({_scaled(bench.day, size) for size in bench.sizes}):
+            params.append(
+                pytest.param(
+                    bench,
+                    size,
+                    id=f"{bench.name}-{size}",
+                    marks=pytest.mark.benchmark(group=f"day{bench.day}_part{bench.part}"),
+                )
+            )
+    return params
+
+
+@pytest.mark.parametrize("bench, size", _params())
+def test_benchmark(benchmark, bench: Benchmark, size: int):
+    module = importlib.import_module(f"aoc2020.day{bench.day}")
+    benchmark(bench.solver, module, bench_input(bench.day, size))
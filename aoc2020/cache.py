@@ -0,0 +1,131 @@
+"""Local cache of puzzle answers.
+
+Answers are stored in a SQLite database keyed by day, part, solver variant, the SHA-256 digest
+of the input and the ``VERSION`` of the day's module. Bumping a day's ``VERSION`` whenever a
+change could affect its answers invalidates that day's entries only: stale entries of the day
+are dropped the next time one of its answers is stored.
+
+The database defaults to ``~/.cache/aoc2020/results.sqlite`` and can be moved with
+``AOC2020_RESULT_CACHE``. It keeps at most ``AOC2020_RESULT_CACHE_SIZE`` entries (10000 by
+default), evicting the least recently used ones.
+"""
+
+import hashlib
+import os
+import pathlib
+import sqlite3
+import time
+from typing import Optional
+
+DEFAULT_MAX_ENTRIES = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    answer TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (day, part, variant, digest, version)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def cache_path() -> pathlib.Path:
+    path = os.environ.get("AOC2020_RESULT_CACHE")
+    if path:
+        return pathlib.Path(path)
+    return pathlib.Path.home() / ".cache" / "aoc2020" / "results.sqlite"
+
+
+def max_entries() -> int:
+    return int(os.environ.get("AOC2020_RESULT_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+
+
+def digest(data: str) -> str:
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    path = cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # worker processes of the runner share the database
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get(day: int, part: int, variant: str, data: str, version: int) -> Optional[str]:
+    """Return the cached answer, or ``None``."""
+    key = (day, part, variant, digest(data), version)
+    conn = _connect()
+    try:
+        with conn:
+            row = conn.execute(
+                "SELECT answer FROM results "
+                "WHERE day = ? AND part = ? AND variant = ? AND digest = ? AND version = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE results SET last_used = ? "
+                "WHERE day = ? AND part = ? AND variant = ? AND digest = ? AND version = ?",
+                (time.time(), *key),
+            )
+            return row[0]
+    finally:
+        conn.close()
+
+
+def put(day: int, part: int, variant: str, data: str, version: int, answer: str) -> None:
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM results WHERE day = ? AND version != ?", (day, version))
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (day, part, variant, digest(data), version, answer, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (max_entries(),),
+            )
+    finally:
+        conn.close()
+
+
+def clear() -> None:
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM results")
+    finally:
+        conn.close()
+
+
+def test_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC2020_RESULT_CACHE", str(tmp_path / "results.sqlite"))
+    monkeypatch.setenv("AOC2020_RESULT_CACHE_SIZE", "3")
+
+    put(15, 2, "default", "0,3,6", 1, "175594")
+    put(22, 2, "default", "data", 1, "291")
+    assert get(15, 2, "default", "0,3,6", 1) == "175594"
+    assert get(15, 2, "default", "0,3,6", 2) is None
+    assert get(15, 1, "default", "0,3,6", 1) is None
+
+    # a new version of day 15 drops its old entries only
+    put(15, 1, "default", "0,3,6", 2, "436")
+    assert get(15, 2, "default", "0,3,6", 1) is None
+    assert get(22, 2, "default", "data", 1) == "291"
+
+    # the least recently used entry is evicted
+    put(1, 1, "default", "a", 1, "1")
+    put(1, 1, "default", "b", 1, "2")
+    assert get(15, 1, "default", "0,3,6", 2) is None
+    assert get(22, 2, "default", "data", 1) == "291"
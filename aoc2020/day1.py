@@ -1,23 +1,170 @@
-import itertools
-from typing import Optional, Sequence
+import functools
+import operator
+from typing import List, Optional, Sequence, Tuple
 
-import aocd
+import numpy as np
 
+from aoc2020 import inputs
 
-def solve_day1(entries: Sequence[int]) -> Optional[int]:
-    for a, b in itertools.permutations(entries, 2):
-        if a + b == 2020:
-            return a * b
+VERSION = 2
+
+
+def two_sum(entries: Sequence[int], target: int) -> Optional[Tuple[int, int]]:
+    """Find two entries summing to ``target`` in a single pass."""
+    seen = set()
+    for entry in entries:
+        if target - entry in seen:
+            return target - entry, entry
+        seen.add(entry)
     return None
 
 
-def solve_day1_part2(entries: Sequence[int]) -> Optional[int]:
-    for a, b, c in itertools.permutations(entries, 3):
-        if a + b + c == 2020:
-            return a * b * c
+def _k_sum_sorted(
+    values: List[int], start: int, k: int, target: int
+) -> Optional[Tuple[int, ...]]:
+    if k == 2:
+        lo, hi = start, len(values) - 1
+        while lo < hi:
+            total = values[lo] + values[hi]
+            if total == target:
+                return values[lo], values[hi]
+            elif total < target:
+                lo += 1
+            else:
+                hi -= 1
+        return None
+
+    for i in range(start, len(values) - k + 1):
+        if i > start and values[i] == values[i - 1]:
+            continue
+        # the smallest and largest sums reachable from here bound the search
+        if values[i] + sum(values[i + 1 : i + k]) > target:
+            break
+        if values[i] + sum(values[len(values) - k + 1 :]) < target:
+            continue
+        rest = _k_sum_sorted(values, i + 1, k - 1, target - values[i])
+        if rest is not None:
+            return (values[i], *rest)
     return None
 
 
+def k_sum(entries: Sequence[int], k: int, target: int = 2020) -> Optional[Tuple[int, ...]]:
+    """Find ``k`` distinct entries summing to ``target``.
+
+    Uses a hash set for k=2 and a sort plus two pointers otherwise, in O(n^(k-1)).
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    elif k == 1:
+        return (target,) if target in entries else None
+    elif k == 2:
+        return two_sum(entries, target)
+    return _k_sum_sorted(sorted(entries), 0, k, target)
+
+
+def test_k_sum():
+    assert k_sum([1721, 979, 366, 299, 675, 1456], 2) == (1721, 299)
+    assert k_sum([1010, 3, 1010], 2) == (1010, 1010)
+    assert k_sum([1010, 3], 2) is None
+    assert k_sum([5, 1, 4, 2, 3, 7], 4, 10) == (1, 2, 3, 4)
+    assert k_sum([5, 1, 4, 2, 3, 7], 5, 100) is None
+
+
+def solve_day1(entries: Sequence[int], target: int = 2020) -> Optional[int]:
+    found = k_sum(entries, 2, target)
+    return None if found is None else functools.reduce(operator.mul, found)
+
+
+def solve_day1_part2(entries: Sequence[int], target: int = 2020) -> Optional[int]:
+    found = k_sum(entries, 3, target)
+    return None if found is None else functools.reduce(operator.mul, found)
+
+
+class ExpenseQuery:
+    """Answer two-sum and three-sum queries for many targets over the same entries.
+
+    The entries are sorted once. Each batch of queries is answered with binary searches
+    vectorized over all targets and entries, instead of one scan of the entries per target.
+    """
+
+    # bound on the number of (target, entry) pairs searched at once
+    CHUNK = 1 << 20
+
+    def __init__(self, entries: Sequence[int]):
+        self.values = np.sort(np.asarray(entries, dtype=np.int64))
+
+    def _pairs(self, targets: np.ndarray, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """For each target, find values[i] + values[j] == target with start <= i < j.
+
+        Returns whether each target was found and the smaller value of its pair.
+        """
+        values = self.values[start:]
+        n = len(values)
+        found = np.zeros(len(targets), dtype=bool)
+        first = np.zeros(len(targets), dtype=np.int64)
+        if n < 2:
+            return found, first
+
+        step = max(1, self.CHUNK // n)
+        for lo in range(0, len(targets), step):
+            complements = targets[lo : lo + step, None] - values[None, :]
+            # only look for the complement after the value itself, so that each entry is
+            # used once and duplicates are found
+            pos = np.maximum(np.searchsorted(values, complements), np.arange(1, n + 1))
+            hit = values[np.minimum(pos, n - 1)] == complements
+            hit &= pos < n
+            found[lo : lo + step] = hit.any(axis=1)
+            first[lo : lo + step] = values[hit.argmax(axis=1)]
+        return found, first
+
+    def two_sum(self, targets: Sequence[int]) -> List[Optional[int]]:
+        """Products of two entries summing to each target, ``None`` if there are none."""
+        totals = np.asarray(targets, dtype=np.int64)
+        found, a = self._pairs(totals, 0)
+        return [int(x * (t - x)) if f else None for f, x, t in zip(found, a, totals)]
+
+    def three_sum(self, targets: Sequence[int]) -> List[Optional[int]]:
+        """Products of three entries summing to each target, ``None`` if there are none."""
+        totals = np.asarray(targets, dtype=np.int64)
+        out: List[Optional[int]] = [None] * len(totals)
+        todo = np.arange(len(totals))
+        values = self.values.tolist()
+        for i, x in enumerate(values[:-2]):
+            # a duplicate finds no triple its first occurrence did not
+            if i and x == values[i - 1]:
+                continue
+            # the smallest sum of x and two later values only grows with x
+            todo = todo[totals[todo] >= x + values[i + 1] + values[i + 2]]
+            if len(todo) == 0:
+                break
+            found, a = self._pairs(totals[todo] - x, i + 1)
+            for k, y in zip(todo[found], a[found]):
+                out[k] = int(x * y * (totals[k] - x - y))
+            todo = todo[~found]
+        return out
+
+
+def test_expense_query():
+    query = ExpenseQuery([1721, 979, 366, 299, 675, 1456, 1010])
+    assert query.two_sum([2020, 2020 + 1, 1010 + 1010 + 1, 366 + 299]) == [
+        514579,
+        None,
+        None,
+        366 * 299,
+    ]
+    assert query.three_sum([2020, 3, 979 + 366 + 299]) == [241861950, None, 979 * 366 * 299]
+
+    entries = list(np.random.default_rng(1).integers(0, 1000, 50))
+    targets = range(0, 3000, 7)
+    query = ExpenseQuery(entries)
+    assert [p is None for p in query.two_sum(targets)] == [
+        k_sum(entries, 2, t) is None for t in targets
+    ]
+    assert [p is None for p in query.three_sum(targets)] == [
+        k_sum(entries, 3, t) is None for t in targets
+    ]
+
+
 def test_solve_day1():
     assert solve_day1([1721, 979, 366, 299, 675, 1456]) == 514579
 
@@ -27,6 +174,6 @@ def test_solve_day1_part2():
 
 
 if __name__ == "__main__":
-    data = [int(s) for s in aocd.get_data(day=1, year=2020).split("\n")]
+    data = [int(s) for s in inputs.get_data(1).split("\n")]
     print(f"Day 1 solution: {solve_day1(data)}")
     print(f"Day 1 part 2 solution: {solve_day1_part2(data)}")
@@ -1,8 +1,11 @@
 from typing import List
 
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+
+VERSION = 1
+
 TEST_DATA = [16, 10, 15, 5, 1, 11, 7, 19, 6, 12, 4]
 
 TEST_DATA2 = [
@@ -69,12 +72,12 @@ def test_day10_part2():
     # assert day10_part2(TEST_DATA) == 8
     # assert day10_part2(TEST_DATA2) == 19208
 
-    data = [int(item) for item in aocd.get_data(day=10, year=2020).split("\n")]
+    data = [int(item) for item in inputs.get_data(10).split("\n")]
     day10_part2(data)
 
 
 def main():
-    data = [int(item) for item in aocd.get_data(day=10, year=2020).split("\n")]
+    data = [int(item) for item in inputs.get_data(10).split("\n")]
     print(f"day 10 part 1: {day10_part1(data)}")
     print(f"day 10 part 2: {day10_part2(data)}")
 
@@ -1,7 +1,10 @@
-import aocd
-import numba
 import numpy as np
-from numba import njit
+
+from aoc2020 import inputs
+from aoc2020.instrument import instrument
+from aoc2020.jit import njit
+
+VERSION = 1
 
 TEST_DATA = """L.LL.LL.LL
 LLLLLLL.LL
@@ -22,9 +25,10 @@ MAP = {".": EMPTY, "L": SEAT, "#": OCCUPIED}
 
 
 def parse(data: str) -> np.ndarray:
-    return np.array([[MAP[c] for c in line] for line in data.split("\n")])
+    return np.array([[MAP[c] for c in line] for line in data.split("\n")], dtype=np.int64)
 
 
+@instrument
 def neighborhood(data: np.ndarray) -> np.ndarray:
     data = np.pad(data, ((1, 1), (1, 1)), "constant") == OCCUPIED
     return np.stack(
@@ -42,6 +46,7 @@ def neighborhood(data: np.ndarray) -> np.ndarray:
     ).sum(axis=2)
 
 
+@instrument
 def day11_part1(data: np.ndarray) -> int:
     while True:
         neighbors = neighborhood(data)
@@ -68,7 +73,10 @@ def to_string(data: np.ndarray) -> str:
     )
 
 
-@njit
+# Kernels are compiled for the grids returned by parse() and cached on disk (see
+# NUMBA_CACHE_DIR to relocate the cache), so that only the first process ever pays for their
+# compilation.
+@njit("int64(float64[:])", cache=True)
 def first_occupied(line: np.ndarray) -> int:
     (idx,) = np.where(line != EMPTY)
     if len(idx) == 0:
@@ -77,7 +85,7 @@ def first_occupied(line: np.ndarray) -> int:
         return 1 if line[idx[0]] == OCCUPIED else 0
 
 
-@njit
+@njit("float64[:, :](int64[:, :])", cache=True)
 def neighborhood_part2(data: np.ndarray) -> np.ndarray:
     padded_data = np.zeros(shape=(data.shape[0] + 2, data.shape[1] + 2))
     padded_data[1:-1, 1:-1] = data
@@ -97,7 +105,7 @@ def neighborhood_part2(data: np.ndarray) -> np.ndarray:
     return out
 
 
-@njit
+@njit("int64(int64[:, :])", cache=True)
 def day11_part2(data: np.ndarray) -> int:
     while True:
         neighbors = neighborhood_part2(data)
@@ -117,8 +125,19 @@ def test_day11_part2():
     assert day11_part2(parse(TEST_DATA)) == 26
 
 
+def warmup() -> None:
+    """Compile or load from cache the numba kernels, for workers to call when they start."""
+    day11_part2(parse(TEST_DATA))
+
+
+def test_warmup():
+    warmup()
+    assert len(day11_part2.signatures) == 1
+    assert len(neighborhood_part2.signatures) == 1
+
+
 def main():
-    data = parse(aocd.get_data(day=11, year=2020))
+    data = parse(inputs.get_data(11))
     print(f"day 11 part 1: {day11_part1(data)}")
     print(f"day 11 part 2: {day11_part2(data)}")
 
@@ -1,6 +1,9 @@
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+
+VERSION = 1
+
 TEST_DATA = """F10
 N3
 F7
@@ -93,8 +96,9 @@ def test_day12_part2():
 
 
 def main():
-    print(f"day 12 part 1: {day12_part1(aocd.get_data(day=12, year=2020))}")
-    print(f"day 12 part 2: {day12_part2(aocd.get_data(day=12, year=2020))}")
+    data = inputs.get_data(12)
+    print(f"day 12 part 1: {day12_part1(data)}")
+    print(f"day 12 part 2: {day12_part2(data)}")
 
 
 if __name__ == "__main__":
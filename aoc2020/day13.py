@@ -2,9 +2,12 @@ import math
 from fractions import Fraction
 from typing import Optional
 
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+
+VERSION = 1
+
 TEST_DATA = """939
 7,13,x,x,59,x,31,19"""
 
@@ -174,7 +177,7 @@ def test_day13_part2():
 
 
 def main():
-    data = aocd.get_data(day=13, year=2020)
+    data = inputs.get_data(13)
     print(f"day 13 part 1: {day13_part1(data)}")
 
     _, data_part2 = data.split("\n")
@@ -1,6 +1,9 @@
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+
+VERSION = 1
+
 TEST_DATA = """mask = XXXXXXXXXXXXXXXXXXXXXXXXXXXXX1XXXX0X
 mem[8] = 11
 mem[7] = 101
@@ -64,8 +67,9 @@ def test_day14_part2():
 
 
 def main():
-    print(f"day 14 part 1: {day14_part1(aocd.get_data(day=14, year=2020))}")
-    print(f"day 14 part 2: {day14_part2(aocd.get_data(day=14, year=2020))}")
+    data = inputs.get_data(14)
+    print(f"day 14 part 1: {day14_part1(data)}")
+    print(f"day 14 part 2: {day14_part2(data)}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
 from collections import Counter
 
+from aoc2020.instrument import instrument
 
+VERSION = 1
+
+
+@instrument
 def day15_part1(data: str, rank: int) -> int:
     lst = [int(c) for c in data.split(",")]
 
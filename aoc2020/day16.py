@@ -2,9 +2,15 @@ import re
 from io import StringIO
 from typing import Dict, List, Tuple
 
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+from aoc2020.records import Records, records
+
+VERSION = 1
+
+RULE_RE = re.compile(r"([\w ]+): (\d+)-(\d+) or (\d+)-(\d+)")
+
 TEST_DATA = """class: 1-3 or 5-7
 row: 6-11 or 33-44
 seat: 13-40 or 45-50
@@ -19,12 +25,12 @@ nearby tickets:
 38,6,12"""
 
 
-def parse(data: str) -> Tuple[Dict[str, List[Tuple[int, int]]], np.ndarray, np.ndarray]:
-    sec1, sec2, sec3 = data.split("\n\n")
+def parse(data: Records) -> Tuple[Dict[str, List[Tuple[int, int]]], np.ndarray, np.ndarray]:
+    sec1, sec2, sec3 = records(data)
 
     rules = {}
     for rule in sec1.split("\n"):
-        res = re.match(r"([\w ]+): (\d+)-(\d+) or (\d+)-(\d+)", rule)
+        res = RULE_RE.match(rule)
         rules[res.group(1)] = [
             (int(res.group(2)), int(res.group(3))),
             (int(res.group(4)), int(res.group(5))),
@@ -40,7 +46,7 @@ def test_parse():
     parse(TEST_DATA)
 
 
-def day16_part1(data: str) -> int:
+def day16_part1(data: Records) -> int:
     rules, my_ticket, other_tickets = parse(data)
 
     invalid = np.ones(shape=other_tickets.shape, dtype=bool)
@@ -57,7 +63,7 @@ def test_day16_part1():
     assert day16_part1(TEST_DATA) == 71
 
 
-def day16_part2(data: str) -> int:
+def day16_part2(data: Records) -> int:
     rules, my_ticket, other_tickets = parse(data)
 
     invalid = np.ones(shape=other_tickets.shape, dtype=bool)
@@ -72,7 +78,7 @@ def day16_part2(data: str) -> int:
     compat_rule = []
     for field in range(other_tickets.shape[1]):
         compat_keys = set()
-        for (key, ((lo1, hi1), (lo2, hi2))) in rules.items():
+        for key, ((lo1, hi1), (lo2, hi2)) in rules.items():
             d = other_tickets[:, field]
             if np.all(((lo1 <= d) & (d <= hi1)) | ((lo2 <= d) & (d <= hi2))):
                 compat_keys.add(key)
@@ -109,8 +115,9 @@ def day16_part2(data: str) -> int:
 
 
 def main():
-    print(f"day 16 part 1: {day16_part1(aocd.get_data(day=16, year=2020))}")
-    print(f"day 16 part 2: {day16_part2(aocd.get_data(day=16, year=2020))}")
+    data = inputs.get_data(16)
+    print(f"day 16 part 1: {day16_part1(data)}")
+    print(f"day 16 part 2: {day16_part2(data)}")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 import itertools
 from collections import Counter
 
-import aocd
 import numpy as np
-from scipy.signal import convolve
+
+from aoc2020 import inputs
+
+VERSION = 1
 
 
 def update_world(world: np.ndarray) -> np.ndarray:
@@ -35,8 +37,9 @@ def test_day17():
 
 
 def main():
-    print(f"day 17 part 1: {day17(aocd.get_data(day=17, year=2020), 6, 3)}")
-    print(f"day 17 part 2: {day17(aocd.get_data(day=17, year=2020), 6, 4)}")
+    data = inputs.get_data(17)
+    print(f"day 17 part 1: {day17(data, 6, 3)}")
+    print(f"day 17 part 2: {day17(data, 6, 4)}")
 
 
 if __name__ == "__main__":
@@ -76,6 +79,8 @@ def test_day17_pure_python_u_leijurv():
 
 
 def day17_part2_scipy_u_wimglenn(data):
+    from scipy.signal import convolve
+
     def evolve(A, n=6):
         kernel = np.ones((3,) * A.ndim, dtype=A.dtype)
         kernel[(1,) * A.ndim] = 0  # hollow center
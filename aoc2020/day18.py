@@ -1,15 +1,22 @@
 import re
 
-import aocd
+from aoc2020 import inputs
+
+VERSION = 1
+
+NUMBER_RE = re.compile(r"^\d+$")
+LAST_OP_RE = re.compile(r"^([\d\s*+]+)([*+])\s*(\d+)$")
+ADDITION_RE = re.compile(r"(\d+\s*\+\s*\d+)")
+PARENS_RE = re.compile(r"\(([\d\s*+]+)\)")
 
 
 def simple_expr(expr: str) -> int:
     expr = expr.strip()
 
-    if re.match(r"^\d+$", expr) is not None:
+    if NUMBER_RE.match(expr) is not None:
         return int(expr)
     else:
-        res = re.match(r"^([\d\s*+]+)([*+])\s*(\d+)$", expr)
+        res = LAST_OP_RE.match(expr)
         if res is None:
             raise ValueError(f"cannot process {expr}")
         else:
@@ -29,11 +36,11 @@ def test_simple_expr():
 def simple_expr_v2(expr: str) -> int:
     expr = expr.strip()
 
-    if re.match(r"^\d+$", expr) is not None:
+    if NUMBER_RE.match(expr) is not None:
         return int(expr)
     else:
         while True:
-            res = re.search(r"(\d+\s*\+\s*\d+)", expr)
+            res = ADDITION_RE.search(expr)
             if res is None:
                 break
 
@@ -52,7 +59,7 @@ def full_expr(expr: str, simple_expr_func=simple_expr) -> str:
     expr = expr.strip()
 
     while True:
-        res = re.search(r"\(([\d\s*+]+)\)", expr)
+        res = PARENS_RE.search(expr)
         if res is None:
             break
 
@@ -82,8 +89,9 @@ def day18(data: str, simple_expr_func) -> int:
 
 
 def main():
-    print(f"day 18 part 1: {day18(aocd.get_data(day=18, year=2020), simple_expr)}")
-    print(f"day 18 part 2: {day18(aocd.get_data(day=18, year=2020), simple_expr_v2)}")
+    data = inputs.get_data(18)
+    print(f"day 18 part 1: {day18(data, simple_expr)}")
+    print(f"day 18 part 2: {day18(data, simple_expr_v2)}")
 
 
 if __name__ == "__main__":
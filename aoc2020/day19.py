@@ -1,9 +1,13 @@
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
-import aocd
 import pytest
 
+from aoc2020 import inputs
+from aoc2020.records import Records, records
+
+VERSION = 1
+
 TEST_DATA = """0: 4 1 5
 1: 2 3 | 3 2
 2: 4 4 | 5 5
@@ -123,8 +127,8 @@ class OptionMatcher(Matcher):
         return False, orig
 
 
-def parse(data: str) -> Tuple[List[str], Dict[int, str]]:
-    part1, part2 = data.split("\n\n")
+def parse(data: Records) -> Tuple[List[str], Dict[int, str]]:
+    part1, part2 = records(data)
 
     rules = {}
     for line in part1.splitlines():
@@ -149,14 +153,14 @@ def build_matcher(rule: str, rules: Dict[int, str]) -> Matcher:
         )
 
 
-def day19_part1(data: str) -> int:
+def day19_part1(data: Records) -> int:
     messages, rules = parse(data)
     matcher = build_matcher(rules[0], rules)
 
     return sum(matcher.match(msg) == (True, "") for msg in messages)
 
 
-def day19_part2(data: str) -> int:
+def day19_part2(data: Records) -> int:
     messages, rules = parse(data)
     matcher_42 = build_matcher(rules[42], rules)
     matcher_31 = build_matcher(rules[31], rules)
@@ -191,8 +195,9 @@ def test_day19_part1():
 
 
 def main():
-    print(f"day 19 part 1: {day19_part1(aocd.get_data(day=19, year=2020))}")
-    print(f"day 19 part 2: {day19_part2(aocd.get_data(day=19, year=2020))}")
+    data = inputs.get_data(19)
+    print(f"day 19 part 1: {day19_part1(data)}")
+    print(f"day 19 part 2: {day19_part2(data)}")
 
 
 if __name__ == "__main__":
@@ -227,17 +232,17 @@ def match_rule(s: str, rule: str, rules: Dict[int, str]) -> Tuple[bool, str]:
         return True, s
 
 
-def day19_part1_v2(data: str) -> int:
+def day19_part1_v2(data: Records) -> int:
     messages, rules = parse(data)
     return sum(match_rule(msg, rules[0], rules) == (True, "") for msg in messages)
 
 
 def test_day18_part1_v2():
     assert day19_part1_v2(TEST_DATA) == 2
-    assert day19_part1_v2(aocd.get_data(day=19, year=2020)) == 192
+    assert day19_part1_v2(inputs.get_data(19)) == 192
 
 
-def day19_part2_v2(data: str) -> int:
+def day19_part2_v2(data: Records) -> int:
     messages, rules = parse(data)
 
     matches = []
@@ -263,7 +268,7 @@ def day19_part2_v2(data: str) -> int:
 @pytest.mark.benchmark(group="day19_part1")
 @pytest.mark.parametrize("func", [day19_part1, day19_part1_v2])
 def test_benchmarks(benchmark, func):
-    data = aocd.get_data(day=19, year=2020)
+    data = inputs.get_data(19)
     res = benchmark(func, data)
     assert res == 192
 
@@ -271,6 +276,6 @@ def test_benchmarks(benchmark, func):
 @pytest.mark.benchmark(group="day19_part2")
 @pytest.mark.parametrize("func", [day19_part2, day19_part2_v2])
 def test_benchmarks_part2(benchmark, func):
-    data = aocd.get_data(day=19, year=2020)
+    data = inputs.get_data(19)
     res = benchmark(func, data)
     assert res == 296
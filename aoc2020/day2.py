@@ -1,12 +1,20 @@
+import os
 import re
+import sys
 from collections import Counter
-from typing import Tuple
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
 
-import aocd
+import numpy as np
+
+from aoc2020 import inputs
+
+VERSION = 2
+
+PASSWORD_RE = re.compile(r"(\d+)-(\d+) (\w): (\w+)")
 
 
 def parse(pwd: str) -> Tuple[int, int, str, str]:
-    res = re.search(r"(\d+)-(\d+) (\w): (\w+)", pwd)
+    res = PASSWORD_RE.search(pwd)
     return int(res.group(1)), int(res.group(2)), res.group(3), res.group(4)
 
 
@@ -36,9 +44,143 @@ def test_check_password_part2():
     assert not check_password_part2("2-9 c: ccccccccc")
 
 
-if __name__ == "__main__":
-    res = sum(check_password(s) for s in aocd.get_data(day=2, year=2020).split("\n"))
-    print("Day 1 part 1 solution: ", res)
+class PasswordColumns(NamedTuple):
+    lo: np.ndarray
+    hi: np.ndarray
+    char: np.ndarray
+    # one row per password, padded with zeros
+    passwords: np.ndarray
+
+
+def _digits_to_int(buf: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(start), dtype=np.int64)
+    for k in range(int((end - start).max())):
+        pos = start + k
+        valid = pos < end
+        out = np.where(valid, out * 10 + buf[np.minimum(pos, len(buf) - 1)] - ord("0"), out)
+    return out
+
+
+def parse_columns(data: str) -> PasswordColumns:
+    """Parse a whole password file at once into columnar arrays.
+
+    Every line is expected to look like ``lo-hi c: password``, the fields are located from the
+    positions of the newlines, dashes and colons in the whole file.
+    """
+    data = data.strip("\n")
+    if not data:
+        empty = np.zeros(0, dtype=np.int64)
+        passwords = np.zeros((0, 1), np.uint8)
+        return PasswordColumns(empty, empty, empty.astype(np.uint8), passwords)
+
+    buf = np.frombuffer((data + "\n").encode(), dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    dashes = np.flatnonzero(buf == ord("-"))
+    colons = np.flatnonzero(buf == ord(":"))
+
+    # zero padded passwords, from two characters after the colon to the end of the line
+    lengths = ends - colons - 2
+    offsets = np.arange(int(lengths.max()))
+    idx = np.minimum(colons[:, None] + 2 + offsets, len(buf) - 1)
+    passwords = np.where(offsets < lengths[:, None], buf[idx], 0).astype(np.uint8)
+
+    return PasswordColumns(
+        lo=_digits_to_int(buf, starts, dashes),
+        hi=_digits_to_int(buf, dashes + 1, colons - 2),
+        char=buf[colons - 1],
+        passwords=passwords,
+    )
+
+
+def count_valid(data: str) -> Tuple[int, int]:
+    """Count the passwords valid under the part 1 and part 2 policies, all rows at once."""
+    cols = parse_columns(data)
+    matches = cols.passwords == cols.char[:, None]
+
+    counts = matches.sum(axis=1)
+    part1 = (cols.lo <= counts) & (counts <= cols.hi)
+
+    width = matches.shape[1]
+
+    def matches_at(pos: np.ndarray) -> np.ndarray:
+        idx = np.clip(pos - 1, 0, width - 1)[:, None]
+        return np.take_along_axis(matches, idx, axis=1)[:, 0] & (pos >= 1) & (pos <= width)
+
+    part2 = matches_at(cols.lo) != matches_at(cols.hi)
+    return int(part1.sum()), int(part2.sum())
 
-    res = sum(check_password_part2(s) for s in aocd.get_data(day=2, year=2020).split("\n"))
-    print("Day 1 part 2 solution: ", res)
+
+def test_count_valid():
+    assert count_valid("1-3 a: abcde\n1-3 b: cdefg\n2-9 c: ccccccccc") == (2, 1)
+    assert count_valid("") == (0, 0)
+    assert count_valid("10-12 x: xxxxxxxxxxxyz\n") == (1, 1)
+
+
+def iter_chunks(fp: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Read a file in chunks of about ``chunk_size`` bytes which end on line boundaries."""
+    rest = b""
+    while True:
+        block = fp.read(chunk_size)
+        if not block:
+            break
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            rest += block
+            continue
+        yield rest + block[:cut]
+        rest = block[cut:]
+    if rest:
+        yield rest
+
+
+def test_iter_chunks():
+    import io
+
+    data = b"1-3 a: abcde\n1-3 b: cdefg\n2-9 c: ccccccccc"
+    for size in (1, 5, 13, 100):
+        chunks = list(iter_chunks(io.BytesIO(data), size))
+        assert b"".join(chunks) == data
+        assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+
+
+def _count_valid_chunk(chunk: bytes) -> Tuple[int, int]:
+    return count_valid(chunk.decode())
+
+
+def count_valid_file(
+    path: str, jobs: Optional[int] = None, chunk_size: int = 1 << 22
+) -> Tuple[int, int]:
+    """Count the valid passwords of a file of any size, one chunk at a time.
+
+    Chunks are checked in ``jobs`` worker processes and only a couple of chunks per worker are
+    held in memory at any time.
+    """
+    import concurrent.futures
+
+    from aoc2020.pool import bounded_map
+
+    jobs = jobs or os.cpu_count() or 1
+    part1 = part2 = 0
+    with open(path, "rb") as fp, concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        for n1, n2 in bounded_map(
+            pool, _count_valid_chunk, iter_chunks(fp, chunk_size), 2 * jobs
+        ):
+            part1 += n1
+            part2 += n2
+    return part1, part2
+
+
+def test_count_valid_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1-3 a: abcde\n1-3 b: cdefg\n2-9 c: ccccccccc\n" * 10)
+    assert count_valid_file(str(path), jobs=2, chunk_size=16) == (20, 10)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        part1, part2 = count_valid_file(sys.argv[1])
+    else:
+        part1, part2 = count_valid(inputs.get_data(2))
+    print("Day 1 part 1 solution: ", part1)
+    print("Day 1 part 2 solution: ", part2)
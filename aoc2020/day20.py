@@ -2,9 +2,13 @@ import re
 from collections import Counter, defaultdict
 from typing import Dict, List, Optional, Set, Tuple
 
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+from aoc2020.records import Records, records
+
+VERSION = 1
+
 TEST_DATA = """Tile 2311:
 ..##.#..#.
 ##..#.....
@@ -120,13 +124,16 @@ MONSTER_DATA = """                  #
  #  #  #  #  #  #   """
 
 MONSTER = np.array([[c == "#" for c in line] for line in MONSTER_DATA.splitlines()])
+MONSTER_SIZE = MONSTER.sum()
+
+TILE_RE = re.compile(r"Tile (\d+):")
 
 
 class Tile:
     @staticmethod
     def from_data(data: str) -> "Tile":
         lines = data.splitlines()
-        res = re.match(r"Tile (\d+):", lines[0])
+        res = TILE_RE.match(lines[0])
         tile_id = int(res.group(1))
         arr = np.array([[c == "#" for c in line] for line in lines[1:]])
         arr.flags.writeable = False
@@ -162,10 +169,10 @@ class Tile:
         return hash(self.data.data.tobytes())
 
 
-def parse(data: str) -> Tuple[Dict[int, Tile], Dict[int, List[Tuple[Tile, int]]]]:
+def parse(data: Records) -> Tuple[Dict[int, Tile], Dict[int, List[Tuple[Tile, int]]]]:
     tile_map = {}
     edge_map = defaultdict(list)
-    for tile_data in data.split("\n\n"):
+    for tile_data in records(data):
         tile = Tile.from_data(tile_data)
         tile_map[tile.id] = tile
         for i, edge in enumerate(tile.edges):
@@ -189,7 +196,7 @@ def find_corners(edge_map):
     return tuple(res)
 
 
-def day20_part1(data: str) -> int:
+def day20_part1(data: Records) -> int:
     tile_map, edge_map = parse(data)
     res = find_corners(edge_map)
     assert len(res) == 4
@@ -222,12 +229,12 @@ def remove_monster(img: np.ndarray) -> np.ndarray:
     di, dj = MONSTER.shape
     for i in range(img.shape[0] - di):
         for j in range(img.shape[1] - dj):
-            if (img[i : i + di, j : j + dj] & MONSTER).sum() == MONSTER.sum():
+            if (img[i : i + di, j : j + dj] & MONSTER).sum() == MONSTER_SIZE:
                 img[i : i + di, j : j + dj] = img[i : i + di, j : j + dj] & (~MONSTER)
     return img
 
 
-def day20_part2(data: str, n: int) -> int:
+def day20_part2(data: Records, n: int) -> int:
     tile_map, edge_map = parse(data)
     seed_id, _, _, _ = find_corners(edge_map)
     seed = tile_map[seed_id]
@@ -305,8 +312,9 @@ def test_day20_part2():
 
 
 def main():
-    print(f"day 20 part 1: {day20_part1(aocd.get_data(day=20, year=2020))}")
-    print(f"day 20 part 2: {day20_part2(aocd.get_data(day=20, year=2020), 12)}")
+    data = inputs.get_data(20)
+    print(f"day 20 part 1: {day20_part1(data)}")
+    print(f"day 20 part 2: {day20_part2(data, 12)}")
 
 
 if __name__ == "__main__":
@@ -2,7 +2,9 @@ import copy
 from collections import defaultdict
 from typing import DefaultDict, Dict, List, Set, Tuple
 
-import aocd
+from aoc2020 import inputs
+
+VERSION = 1
 
 TEST_DATA = """mxmxvkd kfcds sqjhc nhms (contains dairy, fish)
 trh fvjkl sbzzf mxmxvkd (contains dairy)
@@ -67,7 +69,7 @@ def test_day21_part2():
 
 
 def main():
-    foods, allergens = parse(aocd.get_data(day=21, year=2020))
+    foods, allergens = parse(inputs.get_data(21))
     print(f"day 21 part 1: {day21_part1(copy.deepcopy(foods), copy.deepcopy(allergens))}")
     print(f"day 21 part 2: {day21_part2(foods, allergens)}")
 
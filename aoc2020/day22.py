@@ -1,7 +1,11 @@
 from collections import deque
 from typing import Tuple
 
-import aocd
+from aoc2020 import inputs
+from aoc2020.instrument import instrument
+from aoc2020.records import Records, records
+
+VERSION = 1
 
 TEST_DATA = """Player 1:
 9
@@ -18,8 +22,8 @@ Player 2:
 10"""
 
 
-def parse(data: str) -> Tuple[deque, deque]:
-    p1, p2 = data.split("\n\n")
+def parse(data: Records) -> Tuple[deque, deque]:
+    p1, p2 = records(data)
 
     return (
         deque(int(card) for card in p1.splitlines()[1:]),
@@ -27,7 +31,8 @@ def parse(data: str) -> Tuple[deque, deque]:
     )
 
 
-def day22_part1(data: str) -> int:
+@instrument
+def day22_part1(data: Records) -> int:
     p1, p2 = parse(data)
 
     while len(p1) > 0 and len(p2) > 0:
@@ -48,6 +53,7 @@ def test_day22_part1():
     assert day22_part1(TEST_DATA) == 306
 
 
+@instrument
 def game(p1: deque, p2: deque) -> Tuple[int, deque, deque]:
     history = set()
 
@@ -78,7 +84,8 @@ def game(p1: deque, p2: deque) -> Tuple[int, deque, deque]:
     return 1 if len(p1) > 0 else 2, p1, p2
 
 
-def day22_part2(data: str) -> int:
+@instrument
+def day22_part2(data: Records) -> int:
     p1, p2 = parse(data)
 
     winner, p1, p2 = game(p1, p2)
@@ -91,8 +98,9 @@ def test_day22_part2():
 
 
 def main():
-    print(f"day 22 part 1: {day22_part1(aocd.get_data(day=22, year=2020))}")
-    print(f"day 22 part 2: {day22_part2(aocd.get_data(day=22, year=2020))}")
+    data = inputs.get_data(22)
+    print(f"day 22 part 1: {day22_part1(data)}")
+    print(f"day 22 part 2: {day22_part2(data)}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
-from typing import List, Tuple
+import mmap
+import sys
+from typing import Sequence, Tuple, Union
 
-import aocd
 import numpy as np
 
+from aoc2020 import inputs
+
+VERSION = 2
+
 DEMO_DATA = """..##.......
 #...#...#..
 .#....#..#.
@@ -17,7 +22,10 @@ DEMO_DATA = """..##.......
 
 
 def parse(data: str) -> np.ndarray:
-    return np.array([[1 if c == "#" else 0 for c in line] for line in data.split("\n")])
+    """Parse the map straight from its bytes into a boolean array, ``True`` for trees."""
+    width = data.find("\n") if "\n" in data else len(data)
+    buf = np.frombuffer((data.rstrip("\n") + "\n").encode(), dtype=np.uint8)
+    return buf.reshape(-1, width + 1)[:, :width] == ord("#")
 
 
 def test_parse():
@@ -27,31 +35,180 @@ def test_parse():
     assert res[5, 6] == 0
 
 
-def get_indices(
-    data: np.ndarray, col_offset: int, row_offset: int = 1
-) -> Tuple[List[int], List[int]]:
-    rows = np.arange(data.shape[0], step=row_offset)
-    cols = (np.arange(len(rows)) * col_offset) % data.shape[1]
-    return list(rows), list(cols)
-
-
-def solve_day3(data: np.ndarray, col_offset: int = 3, row_offset: int = 1) -> int:
-    rows, cols = get_indices(data, col_offset, row_offset)
-    return data[rows, cols].sum()
+class PackedGrid:
+    """Tree map with one bit per cell."""
+
+    def __init__(self, bits: np.ndarray, width: int):
+        self.bits = bits
+        self.width = width
+        self.rows = bits.shape[0]
+
+    @staticmethod
+    def from_array(grid: np.ndarray) -> "PackedGrid":
+        return PackedGrid(np.packbits(grid.astype(bool), axis=1), grid.shape[1])
+
+    @staticmethod
+    def from_string(data: str) -> "PackedGrid":
+        return PackedGrid.from_array(parse(data))
+
+    def cells(self, start: int, stop: int, step: int) -> np.ndarray:
+        """Unpacked rows ``start:stop:step``."""
+        return np.unpackbits(self.bits[start:stop:step], axis=1, count=self.width).view(bool)
+
+
+class MappedGrid:
+    """Tree map read lazily from a memory-mapped input file.
+
+    All rows have the same width, so row ``i`` starts at byte ``i * (width + 1)`` and the file
+    is viewed as a strided array without copying it. Only the pages holding the rows which
+    are read get loaded.
+    """
+
+    def __init__(self, mm: mmap.mmap):
+        self.mm = mm
+        self.width = mm.find(b"\n")
+        if self.width == -1:
+            self.width = len(mm)
+        size = len(mm) - (len(mm) > 0 and mm[len(mm) - 1 :] == b"\n")
+        self.rows, extra = divmod(size + 1, self.width + 1)
+        if extra:
+            raise ValueError("all rows of the map must have the same width")
+        self.array = np.ndarray(
+            (self.rows, self.width), dtype=np.uint8, buffer=mm, strides=(self.width + 1, 1)
+        )
+
+    @staticmethod
+    def open(path: str) -> "MappedGrid":
+        with open(path, "rb") as fp:
+            return MappedGrid(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def cells(self, start: int, stop: int, step: int) -> np.ndarray:
+        """Rows ``start:stop:step``, ``True`` for trees."""
+        cells = self.array[start:stop:step] == ord("#")
+        # the rows were copied, their pages can leave the resident set of the process
+        if hasattr(mmap, "MADV_DONTNEED"):
+            lo = start * (self.width + 1) // mmap.PAGESIZE * mmap.PAGESIZE
+            hi = min(stop * (self.width + 1), len(self.mm))
+            if hi > lo:
+                self.mm.madvise(mmap.MADV_DONTNEED, lo, hi - lo)
+        return cells
+
+    def close(self) -> None:
+        del self.array
+        self.mm.close()
+
+    def __enter__(self) -> "MappedGrid":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def test_mapped_grid(tmp_path):
+    path = tmp_path / "map.txt"
+    for data in (DEMO_DATA, DEMO_DATA + "\n"):
+        path.write_text(data)
+        with MappedGrid.open(str(path)) as grid:
+            assert (grid.rows, grid.width) == (11, 11)
+            assert (grid.cells(0, 11, 1) == parse(DEMO_DATA)).all()
+            assert solve_day3_part2(grid) == 336
+
+
+Grid = Union[np.ndarray, PackedGrid, MappedGrid]
+
+# bound on the number of cells unpacked at once
+CHUNK = 1 << 22
+
+
+def residue_counts(grid: Union[PackedGrid, MappedGrid], down: int) -> np.ndarray:
+    """Count the trees of the rows visited by slopes going ``down``, by step and column.
+
+    Entry ``[r, c]`` is the number of trees in column ``c`` of the rows reached after ``j``
+    steps, summed over the steps with ``j % width == r``. A slope going ``right`` is in column
+    ``(r * right) % width`` at all those steps.
+    """
+    width = grid.width
+    out = np.zeros((width, width), dtype=np.int64)
+    n_steps = (grid.rows - 1) // down + 1
+    # a multiple of width, so that step j is at row j % width of every block
+    block = max(1, CHUNK // (width * width)) * width
+    for lo in range(0, n_steps, block):
+        cells = grid.cells(lo * down, min(lo + block, n_steps) * down, down)
+        cells = np.pad(cells, ((0, -len(cells) % width), (0, 0)))
+        out += cells.reshape(-1, width, width).sum(axis=0, dtype=np.int64)
+    return out
+
+
+def gather_counts(
+    grid: Union[PackedGrid, MappedGrid], down: int, rights: np.ndarray
+) -> np.ndarray:
+    """Count the trees hit by slopes going ``down`` and each of ``rights``, gathering the
+    visited cells directly."""
+    width = grid.width
+    out = np.zeros(len(rights), dtype=np.int64)
+    n_steps = (grid.rows - 1) // down + 1
+    block = max(1, CHUNK // width)
+    for lo in range(0, n_steps, block):
+        cells = grid.cells(lo * down, min(lo + block, n_steps) * down, down)
+        steps = np.arange(len(cells))
+        out += cells[steps, ((lo + steps) * rights[:, None]) % width].sum(axis=1)
+    return out
+
+
+def count_trees(grid: Grid, slopes: Sequence[Tuple[int, int]]) -> np.ndarray:
+    """Count the trees hit by each (right, down) slope.
+
+    The map is read once per distinct ``down``, after which all the slopes going down by that
+    many rows are counted with a single gather into its ``residue_counts``. Maps wider than
+    the square root of their number of visited rows would make that table larger than the
+    map, their visited cells are gathered directly instead.
+    """
+    if isinstance(grid, np.ndarray):
+        grid = PackedGrid.from_array(grid)
+
+    slope_arr = np.asarray(slopes, dtype=np.int64).reshape(-1, 2)
+    right, down = slope_arr[:, 0], slope_arr[:, 1]
+    if (down < 1).any():
+        raise ValueError(f"slopes must go down at least one row, got {slopes}")
+
+    counts = np.zeros(len(slope_arr), dtype=np.int64)
+    steps = np.arange(grid.width)
+    for d in np.unique(down):
+        sel = down == d
+        if grid.width**2 > (grid.rows - 1) // d + 1:
+            counts[sel] = gather_counts(grid, int(d), right[sel])
+            continue
+        cols = (steps * right[sel, None]) % grid.width
+        counts[sel] = residue_counts(grid, int(d))[steps, cols].sum(axis=1)
+    return counts
+
+
+def test_count_trees():
+    slopes = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2), (0, 1), (11, 3)]
+    counts = count_trees(PackedGrid.from_string(DEMO_DATA), slopes)
+    assert list(counts) == [2, 7, 3, 4, 2, 3, 1]
+    assert list(count_trees(parse(DEMO_DATA), slopes)) == list(counts)
+
+    grid = PackedGrid.from_string(DEMO_DATA)
+    for d in (1, 2, 3):
+        rights = np.array([r for r, down in slopes if down == d])
+        table = residue_counts(grid, d)[np.arange(11), (np.arange(11) * rights[:, None]) % 11]
+        assert list(gather_counts(grid, d, rights)) == list(table.sum(axis=1))
+
+
+def solve_day3(data: Grid, col_offset: int = 3, row_offset: int = 1) -> int:
+    return int(count_trees(data, [(col_offset, row_offset)])[0])
 
 
 def test_solve_day3():
     assert solve_day3(parse(DEMO_DATA)) == 7
 
 
-def solve_day3_part2(data: np.ndarray) -> int:
-    return (
-        solve_day3(data, 1, 1)
-        * solve_day3(data, 3, 1)
-        * solve_day3(data, 5, 1)
-        * solve_day3(data, 7, 1)
-        * solve_day3(data, 1, 2)
-    )
+PART2_SLOPES = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+
+
+def solve_day3_part2(data: Grid) -> int:
+    return int(np.prod(count_trees(data, PART2_SLOPES)))
 
 
 def test_solve_day3_part2():
@@ -59,9 +216,12 @@ def test_solve_day3_part2():
 
 
 def main():
-    data = aocd.get_data(day=3, year=2020)
-    print("Day 3 part 1 results: " + str(solve_day3(parse(data))))
-    print("Day 3 part 2 results: " + str(solve_day3_part2(parse(data))))
+    if len(sys.argv) > 1:
+        grid: Grid = MappedGrid.open(sys.argv[1])
+    else:
+        grid = PackedGrid.from_string(inputs.get_data(3))
+    print("Day 3 part 1 results: " + str(solve_day3(grid)))
+    print("Day 3 part 2 results: " + str(solve_day3_part2(grid)))
 
 
 if __name__ == "__main__":
@@ -1,18 +1,36 @@
+import itertools
 import re
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
-import aocd
+import numpy as np
 
+from aoc2020 import inputs
+from aoc2020.records import Records, records
 
-def parse(data: str) -> List[Dict[str, str]]:
-    def parse_from_passport(passport: str) -> Dict[str, str]:
-        out = {}
-        for item in passport.split():
-            a, b = item.split(":")
-            out[a] = b
-        return out
+VERSION = 2
 
-    return [parse_from_passport(passport) for passport in data.split("\n\n")]
+
+def parse_passport(passport: str) -> Dict[str, str]:
+    out = {}
+    for item in passport.split():
+        a, b = item.split(":")
+        out[a] = b
+    return out
+
+
+def parse(data: Records) -> List[Dict[str, str]]:
+    return [parse_passport(passport) for passport in records(data)]
 
 
 def test_parse():
@@ -37,52 +55,130 @@ iyr:2011 ecl:brn hgt:59in"""
     assert out[3]["eyr"] == "2025"
 
 
-def day4_part1() -> int:
-    data = parse(aocd.get_data(day=4, year=2020))
-    req_fields = {"byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"}
+@dataclass(frozen=True)
+class FieldRule:
+    """Rule for the value of a field.
+
+    The value must be one of ``choices`` if given, or a number of exactly ``digits`` digits if
+    given, or else match ``pattern`` as a whole. If ``ranges`` is given, the number must lie in
+    the range of its unit. For patterns the number is captured by the first group and the unit
+    by the second group, which must only accept the units listed. Units are ``None`` otherwise.
+    """
+
+    pattern: str = ""
+    digits: int = 0
+    ranges: Dict[Optional[str], Tuple[int, int]] = field(default_factory=dict)
+    choices: FrozenSet[str] = frozenset()
+
+
+PASSPORT_SCHEMA = {
+    "byr": FieldRule(digits=4, ranges={None: (1920, 2002)}),
+    "iyr": FieldRule(digits=4, ranges={None: (2010, 2020)}),
+    "eyr": FieldRule(digits=4, ranges={None: (2020, 2030)}),
+    "hgt": FieldRule(r"(\d+)(cm|in)", ranges={"cm": (150, 193), "in": (59, 76)}),
+    "hcl": FieldRule(r"#[0-9a-f]{6}"),
+    "ecl": FieldRule(choices=frozenset(["amb", "blu", "brn", "gry", "grn", "hzl", "oth"])),
+    "pid": FieldRule(digits=9),
+}
+
+
+def _compile_rule(rule: FieldRule) -> Callable[[str], bool]:
+    """A check of the values of a field, doing as little work as the rule allows."""
+    if rule.choices:
+        return set(rule.choices).__contains__
+
+    lo, hi = rule.ranges.get(None, (0, 0))
+    if rule.digits:
+        digits = rule.digits
+        if not rule.ranges:
+            return lambda value: len(value) == digits and value.isascii() and value.isdigit()
+        return lambda value: (
+            len(value) == digits
+            and value.isascii()
+            and value.isdigit()
+            and lo <= int(value) <= hi
+        )
 
-    count = 0
-    for passport in data:
-        if req_fields.issubset(passport):
-            count += 1
-    return count
+    match = re.compile(rule.pattern).fullmatch
+    if not rule.ranges:
+        return lambda value: match(value) is not None
 
+    ranges = rule.ranges
 
-def validate_passport(pp: Dict[str, str]) -> bool:
-    try:
+    def check(value: str) -> bool:
+        res = match(value)
+        if res is None:
+            return False
+        if None in ranges:
+            return lo <= int(res[1]) <= hi
+        bounds = ranges.get(res[2])
+        return bounds is None or bounds[0] <= int(res[1]) <= bounds[1]
+
+    return check
+
+
+class CompiledSchema:
+    """Schema compiled once into a check per field.
+
+    Validation never raises, it returns the name of the first field which is missing or
+    invalid.
+    """
 
-        def check_year(year, lo, hi):
-            assert len(year) == 4
-            assert lo <= int(year) <= hi
+    def __init__(self, schema: Dict[str, FieldRule]):
+        self.schema = schema
+        self.required = frozenset(schema)
+        self.checks = [(name, _compile_rule(rule)) for name, rule in schema.items()]
 
-        check_year(pp["byr"], 1920, 2002)
-        check_year(pp["iyr"], 2010, 2020)
-        check_year(pp["eyr"], 2020, 2030)
+    def failing_field(self, passport: Dict[str, str]) -> Optional[str]:
+        """The first required field missing or invalid in ``passport``, or ``None``."""
+        for name, check in self.checks:
+            value = passport.get(name)
+            if value is None or not check(value):
+                return name
+        return None
 
-        hgt = pp["hgt"]
-        assert hgt[-2:] in ("cm", "in")
+    def missing_field(self, passport: Dict[str, str]) -> Optional[str]:
+        """The first required field missing from ``passport``, or ``None``."""
+        if self.required.issubset(passport):
+            return None
+        return next(name for name in self.schema if name not in passport)
 
-        if hgt[-2:] == "cm":
-            assert 150 <= int(hgt[:-2]) <= 193
-        elif hgt[-2:] == "in":
-            assert 59 <= int(hgt[:-2]) <= 76
 
-        assert re.match(r"^#[a-f0-9]{6}$", pp["hcl"]) is not None
-        assert pp["ecl"] in {"amb", "blu", "brn", "gry", "grn", "hzl", "oth"}
-        assert re.match(r"^\d{9}$", pp["pid"]) is not None
-    # except (AssertionError, KeyError, ValueError, IndexError):
-    except Exception:
-        return False
+PASSPORT = CompiledSchema(PASSPORT_SCHEMA)
 
-    return True
 
+def test_compiled_schema():
+    valid = {
+        "byr": "1980",
+        "iyr": "2012",
+        "eyr": "2030",
+        "hgt": "74in",
+        "hcl": "#623a2f",
+        "ecl": "grn",
+        "pid": "087499704",
+    }
+    assert PASSPORT.failing_field(valid) is None
+    assert PASSPORT.failing_field({**valid, "cid": "1"}) is None
+    assert PASSPORT.missing_field({**valid, "hgt": "170"}) is None
+    assert PASSPORT.failing_field({**valid, "hgt": "170"}) == "hgt"
+    assert PASSPORT.failing_field({**valid, "hgt": "194cm"}) == "hgt"
+    assert PASSPORT.failing_field({**valid, "byr": "19800"}) == "byr"
+    assert PASSPORT.failing_field({**valid, "pid": "0123456789"}) == "pid"
+    del valid["ecl"]
+    assert PASSPORT.missing_field(valid) == "ecl"
 
-def day4_part2_count_valid(data: str) -> int:
-    count = 0
-    for pp in parse(data):
-        if validate_passport(pp):
-            count += 1
-    return count
+
+def day4_part1(data: Records) -> int:
+    passports = map(parse_passport, records(data))
+    return sum(PASSPORT.missing_field(passport) is None for passport in passports)
+
+
+def validate_passport(pp: Dict[str, str]) -> bool:
+    return PASSPORT.failing_field(pp) is None
+
+
+def day4_part2_count_valid(data: Records) -> int:
+    return sum(validate_passport(pp) for pp in map(parse_passport, records(data)))
 
 
 def test_day4_part2_count_valid():
@@ -125,9 +221,226 @@ iyr:2010 hgt:158cm hcl:#b6652a ecl:blu byr:1944 eyr:2021 pid:093154719
     )
 
 
+def _pattern_classes(pattern: str) -> List[FrozenSet[int]]:
+    """The bytes allowed at each position by a fixed-length pattern made of literals, ``\\d``
+    and character sets, each optionally repeated with ``{n}``."""
+    classes: List[FrozenSet[int]] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("\\d", i):
+            allowed = frozenset(b"0123456789")
+            i += 2
+        elif pattern[i] == "[":
+            end = pattern.index("]", i)
+            body = pattern[i + 1 : end]
+            chars: Set[int] = set()
+            for j, c in enumerate(body):
+                if c == "-" and 0 < j < len(body) - 1:
+                    chars.update(range(ord(body[j - 1]), ord(body[j + 1]) + 1))
+                else:
+                    chars.add(ord(c))
+            allowed = frozenset(chars)
+            i = end + 1
+        elif pattern[i] in "\\()|*+?.^$":
+            raise ValueError(f"cannot vectorize pattern {pattern!r}")
+        else:
+            allowed = frozenset([ord(pattern[i])])
+            i += 1
+
+        repeat = 1
+        if pattern.startswith("{", i):
+            end = pattern.index("}", i)
+            repeat = int(pattern[i + 1 : end])
+            i = end + 1
+        classes += [allowed] * repeat
+    return classes
+
+
+def test_pattern_classes():
+    assert _pattern_classes(r"#[0-9a-f]{2}\d") == [
+        frozenset(b"#"),
+        frozenset(b"0123456789abcdef"),
+        frozenset(b"0123456789abcdef"),
+        frozenset(b"0123456789"),
+    ]
+
+
+def _digits(
+    chars: np.ndarray, start: np.ndarray, stop: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Whether ``chars[i, start[i]:stop[i]]`` is a non-empty run of digits, and its value."""
+    pos = np.arange(chars.shape[1])
+    inside = (pos >= start[:, None]) & (pos < stop[:, None])
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    # longer numbers are out of range anyway, and would overflow
+    ok = (stop > start) & (stop - start <= 18) & (is_digit | ~inside).all(axis=1)
+
+    number = np.zeros(len(chars), dtype=np.int64)
+    for k in range(chars.shape[1]):
+        digit = chars[:, k].astype(np.int64) - ord("0")
+        number = np.where(inside[:, k] & ok, number * 10 + digit, number)
+    return ok, number
+
+
+def _check_column(rule: FieldRule, values: np.ndarray) -> np.ndarray:
+    """Vectorized ``FieldRule`` check of a column of byte strings.
+
+    A pattern with ranges is taken to be a number followed by one of the units of its ranges.
+    Other patterns must be accepted by ``_pattern_classes``.
+    """
+    if rule.choices:
+        return np.isin(values, [choice.encode() for choice in rule.choices])
+
+    chars = values.view(np.uint8).reshape(len(values), values.itemsize)
+    lengths = np.char.str_len(values)
+    zeros = np.zeros(len(values), dtype=np.int64)
+
+    if rule.digits:
+        ok, number = _digits(chars, zeros, lengths)
+        ok &= lengths == rule.digits
+        if rule.ranges:
+            lo, hi = rule.ranges[None]
+            ok &= (lo <= number) & (number <= hi)
+        return ok
+
+    if rule.ranges:
+        ok = np.zeros(len(values), dtype=bool)
+        for unit, (lo, hi) in rule.ranges.items():
+            suffix = (unit or "").encode()
+            has_unit = np.char.endswith(values, suffix)
+            is_number, number = _digits(chars, zeros, lengths - len(suffix))
+            ok |= has_unit & is_number & (lo <= number) & (number <= hi)
+        return ok
+
+    classes = _pattern_classes(rule.pattern)
+    ok = lengths == len(classes)
+    for k, allowed in enumerate(classes[: chars.shape[1]]):
+        ok &= np.isin(chars[:, k], list(allowed))
+    return ok
+
+
+def _gather(buf: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """The byte strings ``buf[start[i]:stop[i]]`` as a fixed width ``np.bytes_`` array."""
+    width = max(int((stop - start).max(initial=0)), 1)
+    pos = start[:, None] + np.arange(width)
+    chars = np.where(pos < stop[:, None], buf[np.minimum(pos, len(buf) - 1)], 0)
+    return np.ascontiguousarray(chars, dtype=np.uint8).view(f"S{width}").ravel()
+
+
+def _tokenize(batch: List[str]) -> Iterator[Tuple[bytes, np.ndarray, np.ndarray]]:
+    """Yield ``(key, rows, values)`` for each field found in a batch of passports."""
+    encoded = [passport.encode() for passport in batch]
+    buf = np.frombuffer(b"\n".join(encoded), dtype=np.uint8)
+    if not len(buf):
+        return
+    offsets = np.cumsum([0] + [len(item) + 1 for item in encoded[:-1]])
+
+    space = (buf == ord(" ")) | (buf == ord("\n"))
+    edge = np.flatnonzero(np.diff(space.astype(np.int8), prepend=1, append=1))
+    start, stop = edge[::2], edge[1::2]
+    rows = np.searchsorted(offsets, start, side="right") - 1
+
+    # a token without a colon is a field without a value
+    colon = np.append(np.flatnonzero(buf == ord(":")), len(buf))
+    sep = np.minimum(colon[np.searchsorted(colon, start)], stop)
+    value_start = np.minimum(sep + 1, stop)
+
+    keys, inverse = np.unique(_gather(buf, start, sep), return_inverse=True)
+    for k, key in enumerate(keys):
+        which = np.flatnonzero(inverse == k)
+        yield key, rows[which], _gather(buf, value_start[which], stop[which])
+
+
+class PassportColumns(NamedTuple):
+    """Passports stored as one array of byte strings per field, ``b""`` where absent.
+
+    Bit ``i`` of ``present`` is set for the passports which have field ``fields[i]``.
+    """
+
+    fields: Tuple[str, ...]
+    present: np.ndarray
+    values: Dict[str, np.ndarray]
+
+    @staticmethod
+    def from_records(data: Records, batch_size: int = 1 << 16) -> "PassportColumns":
+        """Tokenize ``batch_size`` passports at a time with whole-array operations."""
+        parts: Dict[bytes, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        n = 0
+        it = iter(records(data))
+        while True:
+            batch = list(itertools.islice(it, batch_size))
+            if not batch:
+                break
+            for key, rows, column in _tokenize(batch):
+                parts.setdefault(key, []).append((rows + n, column))
+            n += len(batch)
+
+        fields = tuple(key.decode() for key in parts)
+        if len(fields) > 64:
+            raise ValueError(f"too many distinct fields ({len(fields)}) for the presence mask")
+        present = np.zeros(n, dtype=np.uint64)
+        values = {}
+        for bit, (name, pieces) in enumerate(zip(fields, parts.values())):
+            idx = np.concatenate([rows for rows, _ in pieces])
+            present[idx] |= np.uint64(1 << bit)
+            column = np.concatenate([column for _, column in pieces])
+            values[name] = np.zeros(n, dtype=column.dtype)
+            values[name][idx] = column
+        return PassportColumns(fields, present, values)
+
+    def mask(self, names) -> np.uint64:
+        """Presence mask of the given fields, which must all appear in some passport."""
+        return np.uint64(sum(1 << self.fields.index(name) for name in names))
+
+    def has_fields(self, schema: Dict[str, FieldRule]) -> np.ndarray:
+        if not set(schema).issubset(self.fields):
+            return np.zeros(len(self.present), dtype=bool)
+        mask = self.mask(schema)
+        return (self.present & mask) == mask
+
+    def valid(self, schema: Dict[str, FieldRule]) -> np.ndarray:
+        ok = self.has_fields(schema)
+        for name, rule in schema.items():
+            if ok.any():
+                ok &= _check_column(rule, self.values[name])
+        return ok
+
+
+def day4_part1_columnar(data: Records) -> int:
+    return int(PassportColumns.from_records(data).has_fields(PASSPORT_SCHEMA).sum())
+
+
+def day4_part2_columnar(data: Records) -> int:
+    return int(PassportColumns.from_records(data).valid(PASSPORT_SCHEMA).sum())
+
+
+def test_columnar():
+    from aoc2020 import generators
+
+    data = generators.generate(4, 500)
+    assert day4_part1_columnar(data) == day4_part1(data)
+    assert day4_part2_columnar(data) == day4_part2_count_valid(data)
+
+    columns = PassportColumns.from_records(iter(data.split("\n\n")), batch_size=7)
+    assert columns.valid(PASSPORT_SCHEMA).sum() == day4_part2_count_valid(data)
+
+    columns = PassportColumns.from_records(
+        "hgt:59in byr:2000\n\nhgt:77in\n\nhgt:160cm\n\nbyr:200", batch_size=3
+    )
+    assert list(_check_column(PASSPORT_SCHEMA["hgt"], columns.values["hgt"])) == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    hgt, byr = columns.mask(["hgt"]), columns.mask(["byr"])
+    assert list(columns.present) == [hgt | byr, hgt, hgt, byr]
+
+
 def main():
-    print(f"day 4 part 1: {day4_part1()}")
-    print(f"day 4 part 2: {day4_part2_count_valid(aocd.get_data(day=4, year=2020))}")
+    data = inputs.get_data(4)
+    print(f"day 4 part 1: {day4_part1(data)}")
+    print(f"day 4 part 2: {day4_part2_count_valid(data)}")
 
 
 if __name__ == "__main__":
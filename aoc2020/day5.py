@@ -1,33 +1,69 @@
-import aocd
+from typing import Tuple
+
 import numpy as np
 
+from aoc2020 import inputs
+
+VERSION = 2
+
+# B and R are the one bits of a seat ID, F and L the zero bits, anything else is invalid
+BITS = np.full(256, 2, dtype=np.uint8)
+BITS[[ord("F"), ord("L")]] = 0
+BITS[[ord("B"), ord("R")]] = 1
+WEIGHTS = 1 << np.arange(9, -1, -1)
+
+
+def seat_ids(data: str) -> np.ndarray:
+    """Decode all the boarding passes at once, straight from the bytes of the input."""
+    buf = np.frombuffer((data.rstrip("\n") + "\n").encode(), dtype=np.uint8)
+    if len(buf) % 11:
+        raise ValueError("boarding passes must be 10 characters long")
+    bits = BITS[buf.reshape(-1, 11)[:, :10]]
+    if (bits > 1).any():
+        raise ValueError("boarding passes must be made of F, B, L and R")
+    return bits @ WEIGHTS
+
 
 def seat_id(seat: str) -> int:
-    row = int(seat[:7].replace("F", "0").replace("B", "1"), 2)
-    col = int(seat[-3:].replace("L", "0").replace("R", "1"), 2)
-    return row * 8 + col
+    return int(seat_ids(seat)[0])
 
 
 def test_seat_id():
     assert seat_id("BFFFBBFRRR") == 567
     assert seat_id("FFFBBBFRRR") == 119
+    assert list(seat_ids("BFFFBBFRRR\nFFFBBBFRRR\nBBFFBBFRLL\n")) == [567, 119, 820]
+
+
+def day5(data: str) -> Tuple[int, int]:
+    """Both parts from a single decode, the missing seat is found with a presence bitmap."""
+    ids = seat_ids(data)
+    present = np.zeros(1 << 10, dtype=bool)
+    present[ids] = True
+    (missing,) = np.nonzero(~present[1:-1] & present[:-2] & present[2:])
+    return int(ids.max()), int(missing[0]) + 1
+
+
+def test_day5():
+    from aoc2020 import generators
+
+    data = generators.generate(5, 100)
+    ids = sorted(int(row, 2) for row in data.translate(str.maketrans("FBLR", "0101")).split())
+    gap = next(a + 1 for a, b in zip(ids, ids[1:]) if b - a == 2)
+    assert day5(data) == (ids[-1], gap)
 
 
-def day5_part1() -> int:
-    return max(seat_id(seat) for seat in aocd.get_data(day=5, year=2020).split("\n"))
+def day5_part1(data: str) -> int:
+    return day5(data)[0]
 
 
-def day5_part2() -> int:
-    a = np.array(
-        list(sorted(seat_id(seat) for seat in aocd.get_data(day=5, year=2020).split("\n")))
-    )
-    (b,) = np.nonzero(np.diff(a) == 2)
-    return a[b[0]] + 1
+def day5_part2(data: str) -> int:
+    return day5(data)[1]
 
 
 def main():
-    print("day 5 part 1: " + str(day5_part1()))
-    print("day 5 part 2: " + str(day5_part2()))
+    part1, part2 = day5(inputs.get_data(5))
+    print("day 5 part 1: " + str(part1))
+    print("day 5 part 2: " + str(part2))
 
 
 if __name__ == "__main__":
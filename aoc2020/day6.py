@@ -1,4 +1,17 @@
-import aocd
+import itertools
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from aoc2020 import inputs
+from aoc2020.records import Records, records
+
+VERSION = 2
+
+BATCH_SIZE = 1 << 16
+
+# number of bits set in each 16-bit value
+POPCOUNT = ((np.arange(1 << 16)[:, None] >> np.arange(16)) & 1).sum(axis=1).astype(np.uint8)
 
 TEST_DATA = """abc
 
@@ -17,29 +30,74 @@ a
 b"""
 
 
-def day6_part1(data: str) -> int:
-    return sum(len(set(group.replace("\n", ""))) for group in data.split("\n\n"))
+def _group_masks(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """The union and intersection of the answers of each group, as 26-bit masks."""
+    buf = np.frombuffer((text.rstrip("\n") + "\n").encode(), dtype=np.uint8)
+    letter = (buf >= ord("a")) & (buf <= ord("z"))
+    bits = np.where(letter, np.left_shift(1, buf - ord("a"), dtype=np.uint32), 0)
+
+    # one mask per line, blank lines separate the groups
+    line_start = np.flatnonzero(np.concatenate(([True], buf[:-1] == ord("\n"))))
+    person = np.bitwise_or.reduceat(bits, line_start)
+    blank = buf[line_start] == ord("\n")
+    group = np.cumsum(blank)[~blank]
+    person = person[~blank]
+    group_start = np.flatnonzero(np.diff(group, prepend=-1))
+    return (
+        np.bitwise_or.reduceat(person, group_start),
+        np.bitwise_and.reduceat(person, group_start),
+    )
+
+
+def _batches(data: Records) -> Iterator[str]:
+    if isinstance(data, str):
+        yield data
+        return
+    it = iter(data)
+    while True:
+        batch = list(itertools.islice(it, BATCH_SIZE))
+        if not batch:
+            return
+        yield "\n\n".join(batch)
+
+
+def _popcount(masks: np.ndarray) -> int:
+    low, high = POPCOUNT[masks & 0xFFFF], POPCOUNT[masks >> 16]
+    return int(low.sum(dtype=np.int64) + high.sum(dtype=np.int64))
+
+
+def day6(data: Records) -> Tuple[int, int]:
+    """Count the questions answered by anyone and by everyone in each group, in one pass."""
+    anyone = everyone = 0
+    for text in _batches(data):
+        union, intersection = _group_masks(text)
+        anyone += _popcount(union)
+        everyone += _popcount(intersection)
+    return anyone, everyone
+
+
+def test_day6():
+    assert day6(TEST_DATA) == (11, 6)
+    assert day6(iter(TEST_DATA.split("\n\n"))) == (11, 6)
+    assert day6("ab\n\n\n") == (2, 2)
+
+
+def day6_part1(data: Records) -> int:
+    return day6(data)[0]
 
 
 def test_day6_part1():
     assert day6_part1(TEST_DATA) == 11
 
 
-def day6_part2(data: str) -> int:
-    def count_group_answers(group):
-        answers = group.split("\n")
-        qs = set(answers[0])
-        for answer in answers[1:]:
-            qs = qs.intersection(set(answer))
-        return len(qs)
-
-    return sum(count_group_answers(group) for group in data.split("\n\n"))
+def day6_part2(data: Records) -> int:
+    return day6(data)[1]
 
 
-def day6_part2_v2(data: str) -> int:
+def day6_part2_v2(data: Records) -> int:
     return sum(
         len(set.intersection(*[set(answer) for answer in group.split("\n")]))
-        for group in data.split("\n\n")
+        for group in records(data)
     )
 
 
@@ -49,8 +107,9 @@ def test_day6_part2():
 
 
 def main():
-    print("day 6 part 1: " + str(day6_part1(aocd.get_data(day=6, year=2020))))
-    print("day 6 part 2: " + str(day6_part2(aocd.get_data(day=6, year=2020))))
+    part1, part2 = day6(inputs.get_data(6))
+    print("day 6 part 1: " + str(part1))
+    print("day 6 part 2: " + str(part2))
 
 
 if __name__ == "__main__":
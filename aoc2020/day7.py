@@ -1,8 +1,13 @@
 import re
+from array import array
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
 
-import aocd
+from aoc2020 import inputs
+
+VERSION = 2
+
+CONTENT_RE = re.compile(r"^(\d+) (\w+ \w+) bags?$")
 
 TEST_DATA = """light red bags contain 1 bright white bag, 2 muted yellow bags.
 dark orange bags contain 3 bright white bags, 4 muted yellow bags.
@@ -34,26 +39,12 @@ class Bag:
 
         out = {}
         for bag in part2.split(", "):
-            res = re.match(r"^(\d+) (\w+ \w+) bags?$", bag)
+            res = CONTENT_RE.match(bag)
             if res:
                 out[res.group(2)] = int(res.group(1))
 
         return Bag(color=part1, contents=out)
 
-    def contains(self, target: str, bags: Dict[str, "Bag"]) -> bool:
-        """Check the existence of a given color in this bag according to the provided rules."""
-        for color in self.contents:
-            if color == target or bags[color].contains(target, bags):
-                return True
-        return False
-
-    def count_content(self, bags: Dict[str, "Bag"]) -> int:
-        total = 0
-        for color, cnt in self.contents.items():
-            total += cnt
-            total += cnt * bags[color].count_content(bags)
-        return total
-
 
 def test_bag_from_string():
     assert Bag.from_string(
@@ -77,10 +68,219 @@ def parse_all(data: str) -> Dict[str, Bag]:
     }
 
 
+def parse_edges(data: str) -> Tuple[List[str], array, array, array]:
+    """Parse all the rules in a single pass into the interned colours and the edge arrays
+    ``(src, dst, count)``, bag ``src[i]`` containing ``count[i]`` bags ``dst[i]``."""
+    ids: Dict[str, int] = {}
+    src, dst, count = array("l"), array("l"), array("l")
+    for line in data.splitlines():
+        color, _, contents = line.partition(" bags contain ")
+        if not contents:
+            continue
+        outer = ids.setdefault(color, len(ids))
+        if contents.startswith("no other"):
+            continue
+        # each item reads "<count> <adjective> <colour> bag(s)"
+        for item in contents.split(", "):
+            n, adjective, inner, _ = item.split(" ", 3)
+            src.append(outer)
+            dst.append(ids.setdefault(f"{adjective} {inner}", len(ids)))
+            count.append(int(n))
+    return list(ids), src, dst, count
+
+
+def test_parse_edges():
+    colors, src, dst, count = parse_edges(TEST_DATA)
+    assert len(colors) == 9 and len(src) == 13
+    edges = {(colors[s], colors[d]): n for s, d, n in zip(src, dst, count)}
+    assert edges == {
+        (bag.color, color): n
+        for bag in parse_all(TEST_DATA).values()
+        for color, n in bag.contents.items()
+    }
+
+
+class GraphStats(NamedTuple):
+    colors: int
+    edges: int
+    max_fan_out: int
+    # longest chain of nested bags, each cycle counting as a single bag
+    depth: int
+    # strongly connected components, as many as colors unless there are cycles
+    components: int
+
+
+class BagGraph:
+    """Bag rules as a graph over colours interned to integer IDs.
+
+    ``contents[i]`` lists the ``(color, count)`` pairs bag ``i`` holds and ``containers[i]``
+    the bags directly holding bag ``i``. All traversals are iterative, so that arbitrarily deep
+    rule sets are fine, and linear in the size of the graph.
+    """
+
+    def __init__(
+        self,
+        colors: Sequence[str],
+        src: Iterable[int],
+        dst: Iterable[int],
+        count: Iterable[int],
+    ):
+        self.colors = list(colors)
+        self.ids = {color: i for i, color in enumerate(self.colors)}
+        self.contents: List[List[Tuple[int, int]]] = [[] for _ in self.colors]
+        self.containers: List[List[int]] = [[] for _ in self.colors]
+        for s, d, n in zip(src, dst, count):
+            self.contents[s].append((d, n))
+            self.containers[d].append(s)
+
+    @staticmethod
+    def from_bags(bags: Iterable[Bag]) -> "BagGraph":
+        ids: Dict[str, int] = {}
+        src, dst, count = [], [], []
+        for bag in bags:
+            s = ids.setdefault(bag.color, len(ids))
+            for color, n in bag.contents.items():
+                src.append(s)
+                dst.append(ids.setdefault(color, len(ids)))
+                count.append(n)
+        return BagGraph(list(ids), src, dst, count)
+
+    @staticmethod
+    def from_string(data: str) -> "BagGraph":
+        return BagGraph(*parse_edges(data))
+
+    def holders(self, color: str) -> Set[int]:
+        """IDs of the bags which eventually contain a bag of the given colour."""
+        seen: Set[int] = set()
+        todo = list(self.containers[self.ids[color]])
+        while todo:
+            bag = todo.pop()
+            if bag not in seen:
+                seen.add(bag)
+                todo.extend(self.containers[bag])
+        return seen
+
+    def count_content(self, color: str) -> int:
+        """Number of bags inside a bag of the given colour.
+
+        Raises ``ValueError`` if the bag is part of, or contains, a cycle.
+        """
+        # 0: not visited yet, 1: its content is being counted, 2: counted
+        state = bytearray(len(self.colors))
+        total = [0] * len(self.colors)
+        stack = [self.ids[color]]
+        while stack:
+            bag = stack[-1]
+            if state[bag] == 0:
+                state[bag] = 1
+                for inner, _ in self.contents[bag]:
+                    if state[inner] == 1:
+                        color = self.colors[inner]
+                        raise ValueError(f"{color} bags eventually contain themselves")
+                    if state[inner] == 0:
+                        stack.append(inner)
+                continue
+
+            stack.pop()
+            if state[bag] == 1:
+                total[bag] = sum(n * (1 + total[inner]) for inner, n in self.contents[bag])
+                state[bag] = 2
+        return total[self.ids[color]]
+
+    def components(self) -> List[int]:
+        """Strongly connected component of each bag (Tarjan's algorithm).
+
+        Components are numbered in reverse topological order, a bag only contains bags of its
+        own component or of lower numbered ones.
+        """
+        n = len(self.colors)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        component = [-1] * n
+        stack: List[int] = []
+        counter = components = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            while work:
+                bag, i = work.pop()
+                if i == 0:
+                    index[bag] = low[bag] = counter
+                    counter += 1
+                    stack.append(bag)
+                    on_stack[bag] = True
+
+                contents = self.contents[bag]
+                while i < len(contents):
+                    inner = contents[i][0]
+                    if index[inner] < 0:
+                        work.append((bag, i + 1))
+                        work.append((inner, 0))
+                        break
+                    if on_stack[inner]:
+                        low[bag] = min(low[bag], index[inner])
+                    i += 1
+                else:
+                    if low[bag] == index[bag]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component[member] = components
+                            if member == bag:
+                                break
+                        components += 1
+                    if work:
+                        outer = work[-1][0]
+                        low[outer] = min(low[outer], low[bag])
+        return component
+
+    def stats(self) -> GraphStats:
+        component = self.components()
+        count = max(component, default=-1) + 1
+        depth = [0] * count
+        for bag in sorted(range(len(self.colors)), key=component.__getitem__):
+            c = component[bag]
+            for inner, _ in self.contents[bag]:
+                if component[inner] != c:
+                    depth[c] = max(depth[c], depth[component[inner]] + 1)
+
+        return GraphStats(
+            colors=len(self.colors),
+            edges=sum(map(len, self.contents)),
+            max_fan_out=max(map(len, self.contents), default=0),
+            depth=max(depth, default=0),
+            components=count,
+        )
+
+
+def test_bag_graph():
+    import pytest
+
+    graph = BagGraph.from_bags(parse_all(TEST_DATA).values())
+    assert graph.stats() == GraphStats(
+        colors=9, edges=13, max_fan_out=2, depth=4, components=9
+    )
+
+    # deep chains are no problem for the iterative traversals
+    n = 100000
+    chain = BagGraph([str(i) for i in range(n)], range(n - 1), range(1, n), [2] * (n - 1))
+    assert len(chain.holders(str(n - 1))) == n - 1
+    assert chain.count_content(str(n - 10)) == 2**10 - 2
+    assert chain.stats().depth == n - 1
+
+    cyclic = BagGraph(["a", "b", "c", "d"], [0, 1, 2, 0], [1, 2, 1, 3], [1, 1, 1, 1])
+    assert cyclic.holders("b") == {0, 1, 2}
+    assert cyclic.count_content("d") == 0
+    with pytest.raises(ValueError):
+        cyclic.count_content("a")
+    assert cyclic.stats().components == 3
+    assert cyclic.stats().depth == 1
+
+
 def day7_part1(data: str) -> int:
-    # parse all rules
-    bags = parse_all(data)
-    return sum(bag.contains("shiny gold", bags) for bag in bags.values())
+    return len(BagGraph.from_string(data).holders("shiny gold"))
 
 
 def test_day7_part1():
@@ -88,8 +288,7 @@ def test_day7_part1():
 
 
 def day7_part2(data: str) -> int:
-    bags = parse_all(data)
-    return bags["shiny gold"].count_content(bags)
+    return BagGraph.from_string(data).count_content("shiny gold")
 
 
 def test_day7_part2():
@@ -98,8 +297,9 @@ def test_day7_part2():
 
 
 def main():
-    print(f"Day 7 part 1: {day7_part1(aocd.get_data(day=7, year=2020))}")
-    print(f"Day 7 part 2: {day7_part2(aocd.get_data(day=7, year=2020))}")
+    data = inputs.get_data(7)
+    print(f"Day 7 part 1: {day7_part1(data)}")
+    print(f"Day 7 part 2: {day7_part2(data)}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,18 @@
-from typing import List, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 
-import aocd
+import numpy as np
+
+from aoc2020 import inputs
+from aoc2020.instrument import instrument
+from aoc2020.jit import njit
+
+VERSION = 2
+
+ACC, JMP, NOP = 0, 1, 2
+OPCODES = {"acc": ACC, "jmp": JMP, "nop": NOP}
+
+# why an execution stops
+TERMINATED, LOOPED, STEP_LIMIT, OUT_OF_BOUNDS = range(4)
 
 TEST_PROG = """nop +0
 acc +1
@@ -23,45 +35,138 @@ nop -4
 acc +6"""
 
 
-ProgType = List[Tuple[str, int]]
+class Program(NamedTuple):
+    """A program compiled to parallel arrays of opcodes and arguments."""
+
+    ops: np.ndarray
+    args: np.ndarray
 
 
-def parse_program(data: str) -> ProgType:
-    def parse_line(line: str) -> Tuple[str, int]:
-        parts = line.split()
-        return parts[0], int(parts[1])
+def parse_program(data: str) -> Program:
+    tokens = data.split()
+    try:
+        ops = np.array([OPCODES[op] for op in tokens[::2]], dtype=np.int8)
+    except KeyError as exc:
+        raise ValueError(f"unknown instruction: {exc.args[0]}") from None
+    args = np.array(list(map(int, tokens[1::2])), dtype=np.int64)
+    if len(ops) != len(args):
+        raise ValueError("every instruction takes one argument")
+    return Program(ops, args)
 
-    return [parse_line(ln) for ln in data.split("\n")]
 
+class Execution(NamedTuple):
+    accumulator: int
+    # one of TERMINATED, LOOPED or STEP_LIMIT
+    status: int
+    steps: int
+    # how many times each instruction was executed, if requested
+    hits: Optional[np.ndarray] = None
+    # the address of each executed instruction, if requested
+    trace: Optional[np.ndarray] = None
 
-def run(prog: ProgType) -> Tuple[int, bool]:
+
+@njit(cache=True)
+def _execute(ops, args, seen, hits, trace, max_steps, stop_on_loop):
+    """Interpreter loop, run as is on lists or compiled by numba for arrays.
+
+    ``hits`` and ``trace`` are only filled in when they are not empty.
+    """
+    n = len(ops)
+    count_hits = len(hits) > 0
+    record_trace = len(trace) > 0
     pc = 0
-    executed = [False] * len(prog)
     accum = 0
-
+    steps = 0
     while True:
-        if executed[pc]:
-            return accum, False
-        executed[pc] = True
+        if pc == n:
+            return accum, pc, steps, TERMINATED
+        if pc < 0 or pc > n:
+            return accum, pc, steps, OUT_OF_BOUNDS
+        if stop_on_loop:
+            if seen[pc]:
+                return accum, pc, steps, LOOPED
+            seen[pc] = True
+        if steps == max_steps:
+            return accum, pc, steps, STEP_LIMIT
 
-        op, param = prog[pc]
+        if count_hits:
+            hits[pc] += 1
+        if record_trace:
+            trace[steps] = pc
+        steps += 1
 
-        if op == "acc":
-            accum += param
-            pc += 1
-        elif op == "jmp":
-            pc += param
-        elif op == "nop":
+        op = ops[pc]
+        if op == ACC:
+            accum += args[pc]
             pc += 1
+        elif op == JMP:
+            pc += args[pc]
         else:
-            raise ValueError(f"unknown instruction: {op, param}")
+            pc += 1
+
+
+def execute(
+    prog: Program,
+    max_steps: Optional[int] = None,
+    stop_on_loop: bool = True,
+    hits: bool = False,
+    trace: bool = False,
+    jit: bool = False,
+) -> Execution:
+    """Run a program until it terminates, executes an instruction a second time (unless
+    ``stop_on_loop`` is false) or has executed ``max_steps`` instructions.
+
+    With ``jit`` the interpreter loop is compiled by numba, which pays off for long programs.
+    """
+    n = len(prog.ops)
+    # the loop check stops the execution within n steps
+    if max_steps is None:
+        if not stop_on_loop:
+            raise ValueError("max_steps is required when not stopping on loops")
+        limit = -1
+        trace_size = n
+    else:
+        limit = max_steps
+        trace_size = min(max_steps, n) if stop_on_loop else max_steps
 
-        if pc == len(prog):
-            break
-        elif pc >= len(prog):
-            raise RuntimeError(f"jmp past EOF attempted: pc={pc} len={len(prog)}")
+    if jit:
+        seen = np.zeros(n if stop_on_loop else 0, dtype=np.bool_)
+        hit_counts = np.zeros(n if hits else 0, dtype=np.int64)
+        addresses = np.zeros(trace_size if trace else 0, dtype=np.int64)
+        accum, pc, steps, status = _execute(
+            prog.ops, prog.args, seen, hit_counts, addresses, limit, stop_on_loop
+        )
+    else:
+        # plain Python is much faster on lists than on arrays
+        hit_list = [0] * n if hits else []
+        address_list = [0] * trace_size if trace else []
+        accum, pc, steps, status = _execute.py_func(
+            prog.ops.tolist(),
+            prog.args.tolist(),
+            bytearray(n if stop_on_loop else 0),
+            hit_list,
+            address_list,
+            limit,
+            stop_on_loop,
+        )
+        hit_counts = np.array(hit_list, dtype=np.int64)
+        addresses = np.array(address_list, dtype=np.int64)
 
-    return accum, True
+    if status == OUT_OF_BOUNDS:
+        raise RuntimeError(f"jmp past EOF attempted: pc={pc} len={n}")
+    return Execution(
+        int(accum),
+        status,
+        steps,
+        hit_counts if hits else None,
+        addresses[:steps] if trace else None,
+    )
+
+
+@instrument
+def run(prog: Program) -> Tuple[int, bool]:
+    res = execute(prog)
+    return res.accumulator, res.status == TERMINATED
 
 
 def test_run():
@@ -69,24 +174,124 @@ def test_run():
     assert run(parse_program(TEST_PROG_CORRECTED)) == (8, True)
 
 
-def correct_and_run(prog: ProgType) -> int:
-    for i in range(len(prog)):
-        if prog[i][0] in ("jmp", "nop"):
-            fixed_prog = prog.copy()
-            fixed_prog[i] = ("jmp" if prog[i][0] == "nop" else "nop", prog[i][1])
-            accum, completed = run(fixed_prog)
-            if completed:
-                return accum
-    raise RuntimeError("could not fix program")
+class Repair(NamedTuple):
+    # address of the jmp or nop to swap
+    address: int
+    # accumulator of the repaired program when it terminates
+    accumulator: int
+
+
+def _reaching_end(succ: np.ndarray, acc: np.ndarray) -> Tuple[bytearray, List[int]]:
+    """Which instructions lead to the end of the program, and what they add to the
+    accumulator on their way there, found by walking the reversed edges back from the end."""
+    n = len(succ)
+    (sources,) = np.nonzero((succ >= 0) & (succ <= n))
+    sources = sources[np.argsort(succ[sources], kind="stable")]
+    starts = np.searchsorted(succ[sources], np.arange(n + 2)).tolist()
+    sources_list, acc_list = sources.tolist(), acc.tolist()
+
+    good = bytearray(n + 1)
+    to_end = [0] * (n + 1)
+    good[n] = 1
+    # every instruction has a single successor, so the reversed edges from the end form a tree
+    todo = [n]
+    while todo:
+        target = todo.pop()
+        for source in sources_list[starts[target] : starts[target + 1]]:
+            good[source] = 1
+            to_end[source] = acc_list[source] + to_end[target]
+            todo.append(source)
+    return good, to_end
+
+
+def repairs(prog: Program, jit: bool = False) -> List[Repair]:
+    """All the single jmp/nop swaps which make a looping program terminate, in the order
+    their instructions are first executed. Linear in the size of the program.
+    """
+    n = len(prog.ops)
+    address = np.arange(n)
+    is_jmp = prog.ops == JMP
+    succ = np.where(is_jmp, address + prog.args, address + 1)
+    alt = np.where(is_jmp, address + 1, address + prog.args)
+    acc = np.where(prog.ops == ACC, prog.args, 0)
+    good, to_end = _reaching_end(succ, acc)
+
+    res = execute(prog, trace=True, jit=jit)
+    if res.status == TERMINATED or res.trace is None:
+        return []
+    # a swap off the executed path changes nothing, and a swap on the path terminates iff
+    # its new successor leads to the end of the unchanged program
+    path = res.trace
+    before = np.cumsum(acc[path]) - acc[path]
+    (steps,) = np.nonzero(prog.ops[path] != ACC)
+    targets = alt[path[steps]]
+    inside = (targets >= 0) & (targets <= n)
+    steps, targets = steps[inside], targets[inside]
+    fixed = np.frombuffer(good, dtype=np.uint8)[targets] == 1
+    steps, targets = steps[fixed], targets[fixed]
+
+    accumulators = before[steps] + np.array(to_end)[targets]
+    return [Repair(*fix) for fix in zip(path[steps].tolist(), accumulators.tolist())]
+
+
+@instrument
+def correct_and_run(prog: Program) -> int:
+    fixes = repairs(prog)
+    if not fixes:
+        raise RuntimeError("could not fix program")
+    return fixes[0].accumulator
+
+
+def test_execute():
+    import pytest
+
+    prog = parse_program(TEST_PROG)
+    for jit in (False, True):
+        res = execute(prog, hits=True, trace=True, jit=jit)
+        assert (res.accumulator, res.status, res.steps) == (5, LOOPED, 7)
+        assert list(res.trace) == [0, 1, 2, 6, 7, 3, 4]
+        assert list(res.hits) == [1, 1, 1, 1, 1, 0, 1, 1, 0]
+
+        res = execute(prog, max_steps=20, stop_on_loop=False, hits=True, jit=jit)
+        assert (res.status, res.steps, res.trace) == (STEP_LIMIT, 20, None)
+        assert res.hits.sum() == 20 and res.hits[0] == 1
+
+        res = execute(parse_program(TEST_PROG_CORRECTED), max_steps=5, jit=jit)
+        assert (res.accumulator, res.status, res.steps) == (2, STEP_LIMIT, 5)
+        with pytest.raises(RuntimeError):
+            execute(parse_program("nop +0\njmp +2"), jit=jit)
+
+    with pytest.raises(ValueError):
+        parse_program("mul +2")
 
 
 def test_correct_and_run():
     assert correct_and_run(parse_program(TEST_PROG)) == 8
+    assert repairs(parse_program(TEST_PROG)) == [Repair(7, 8)]
+    assert repairs(parse_program(TEST_PROG_CORRECTED)) == []
+
+    # both swaps work, jumping over the acc or not
+    assert repairs(parse_program("nop +3\nacc +1\njmp -2")) == [Repair(0, 0), Repair(2, 1)]
+
+
+def test_repairs():
+    from aoc2020 import generators
+
+    prog = parse_program(generators.generate(8, 300))
+    expected = []
+    for pc in np.flatnonzero(prog.ops != ACC):
+        ops = prog.ops.copy()
+        ops[pc] = JMP if ops[pc] == NOP else NOP
+        res = execute(Program(ops, prog.args))
+        if res.status == TERMINATED:
+            expected.append((pc, res.accumulator))
+    assert sorted(repairs(prog)) == expected
 
 
 def main():
-    print(f"day 8 part 1: {run(parse_program(aocd.get_data(day=8, year=2020)))[0]}")
-    print(f"day 8 part 2: {correct_and_run(parse_program(aocd.get_data(day=8, year=2020)))}")
+    data = inputs.get_data(8)
+    print(f"day 8 part 1: {run(parse_program(data))[0]}")
+    print(f"day 8 part 2: {correct_and_run(parse_program(data))}")
 
 
 if __name__ == "__main__":
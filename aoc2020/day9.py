@@ -1,7 +1,9 @@
-import itertools
-from typing import List
+import collections
+from typing import Deque, Dict, Iterable, Iterator, List, Tuple
 
-import aocd
+from aoc2020 import inputs
+
+VERSION = 2
 
 TEST_DATA = [
     35,
@@ -27,16 +29,65 @@ TEST_DATA = [
 ]
 
 
-def find_fault(data: List[int], width: int) -> int:
-    for i, item in enumerate(data[width:]):
-        if item not in (a + b for a, b in itertools.permutations(data[i : i + width], 2)):
-            return item
+class Window:
+    """The last ``width`` numbers of a stream, along with how many times each value appears
+    in them, updated in constant time as the window slides."""
+
+    def __init__(self, width: int):
+        self.width = width
+        self.values: Deque[int] = collections.deque()
+        self.counts: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: int) -> None:
+        self.values.append(value)
+        self.counts[value] = self.counts.get(value, 0) + 1
+        if len(self.values) > self.width:
+            old = self.values.popleft()
+            if self.counts[old] == 1:
+                del self.counts[old]
+            else:
+                self.counts[old] -= 1
+
+    def is_pair_sum(self, target: int) -> bool:
+        """Whether two numbers at different positions of the window add up to ``target``."""
+        counts = self.counts
+        for value in counts:
+            other = target - value
+            if other in counts and (other != value or counts[value] > 1):
+                return True
+        return False
+
+
+def iter_faults(data: Iterable[int], width: int) -> Iterator[Tuple[int, int]]:
+    """Yield the position and value of the numbers which are not the sum of two of the
+    ``width`` numbers before them."""
+    window = Window(width)
+    for i, item in enumerate(data):
+        if len(window) == width and not window.is_pair_sum(item):
+            yield i, item
+        window.push(item)
+
+
+def find_fault(data: Iterable[int], width: int) -> int:
+    for _, item in iter_faults(data, width):
+        return item
 
     raise ValueError("could not find faulty value")
 
 
+def find_faults(data: Iterable[int], width: int) -> List[int]:
+    """Positions of all the faulty numbers, not just the first one."""
+    return [i for i, _ in iter_faults(data, width)]
+
+
 def test_find_fault():
     assert find_fault(TEST_DATA, 5) == 127
+    assert find_faults(TEST_DATA, 5) == [14]
+    # the two numbers must be at different positions, but can be equal
+    assert find_faults([1, 2, 2, 4, 5, 6], 3) == [4]
 
 
 def find_weakness(data: List[int], target: int) -> int:
@@ -60,7 +111,7 @@ def test_find_weakness():
 
 
 def main():
-    data = [int(item) for item in aocd.get_data(day=9, year=2020).split("\n")]
+    data = [int(item) for item in inputs.get_data(9).split("\n")]
     part1 = find_fault(data, 25)
     print(f"day 9 part 1: {part1}")
     print(f"day 9 part 2: {find_weakness(data, part1)}")
@@ -0,0 +1,660 @@
+"""Seeded synthetic puzzle inputs of arbitrary size, for load tests and benchmarks.
+
+``generate(day, size, seed)`` returns an input string in the same format as the real puzzle
+input (no trailing newline). ``size`` is the natural scale of each day (number of lines,
+records, colours, instructions, tiles per side...). The same arguments always produce the same
+input.
+"""
+
+import itertools
+import random
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+SYLLABLES = [c + v for c in "bdfgklmnprtvz" for v in "aeiou"]
+
+
+def _word(i: int) -> str:
+    """Deterministic pronounceable word for an integer, e.g. ``0 -> "ba"``."""
+    out = SYLLABLES[i % len(SYLLABLES)]
+    i //= len(SYLLABLES)
+    while i > 0:
+        out += SYLLABLES[i % len(SYLLABLES)]
+        i //= len(SYLLABLES)
+    return out
+
+
+def day1(size: int, rng: random.Random) -> str:
+    """Expense report with one pair and one triple summing to 2020, padded with entries which
+    cannot take part in any other solution."""
+    while True:
+        a = rng.randint(10, 1000)
+        x, y = rng.randint(10, 660), rng.randint(10, 660)
+        small = [a, x, y, 2020 - x - y]
+        sums = {u + v for u, v in itertools.combinations(small, 2)}
+        if len(set(small)) == 4 and 2020 not in sums and a + x + y != 2020:
+            break
+
+    forbidden = {2020 - v for v in small} | {2020 - s for s in sums}
+    filler_range = [v for v in range(1011, 2020) if v not in forbidden]
+    entries = small + [2020 - a] + rng.choices(filler_range, k=max(size - 5, 0))
+    rng.shuffle(entries)
+    return "\n".join(str(e) for e in entries)
+
+
+def day2(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        lo = rng.randint(1, 10)
+        hi = rng.randint(lo + 1, 20)
+        c = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        pwd = "".join(rng.choices(c * 4 + "abcdefghijklmnopqrstuvwxyz", k=rng.randint(hi, 24)))
+        lines.append(f"{lo}-{hi} {c}: {pwd}")
+    return "\n".join(lines)
+
+
+def day3(size: int, rng: random.Random, width: int = 31, density: float = 0.25) -> str:
+    return "\n".join(
+        "".join("#" if rng.random() < density else "." for _ in range(width))
+        for _ in range(size)
+    )
+
+
+PASSPORT_FIELDS = {
+    "byr": (lambda r: str(r.randint(1920, 2002)), lambda r: str(r.randint(1850, 1919))),
+    "iyr": (lambda r: str(r.randint(2010, 2020)), lambda r: str(r.randint(2021, 2099))),
+    "eyr": (lambda r: str(r.randint(2020, 2030)), lambda r: str(r.randint(1950, 2019))),
+    "hgt": (
+        lambda r: r.choice([f"{r.randint(150, 193)}cm", f"{r.randint(59, 76)}in"]),
+        lambda r: r.choice([f"{r.randint(194, 250)}cm", f"{r.randint(10, 58)}in", "170"]),
+    ),
+    "hcl": (
+        lambda r: "#" + "".join(r.choices("0123456789abcdef", k=6)),
+        lambda r: "".join(r.choices("0123456789abcdef", k=6)),
+    ),
+    "ecl": (
+        lambda r: r.choice(["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]),
+        lambda r: r.choice(["xry", "zzz", "red", "#123abc"]),
+    ),
+    "pid": (
+        lambda r: "".join(r.choices("0123456789", k=9)),
+        lambda r: "".join(r.choices("0123456789", k=r.choice([8, 10]))),
+    ),
+    "cid": (lambda r: str(r.randint(1, 999)), lambda r: str(r.randint(1, 999))),
+}
+
+
+def day4(size: int, rng: random.Random) -> str:
+    passports = []
+    for _ in range(size):
+        items = []
+        for name, (valid, invalid) in PASSPORT_FIELDS.items():
+            if rng.random() < 0.06:
+                continue
+            value = valid(rng) if rng.random() < 0.9 else invalid(rng)
+            items.append(f"{name}:{value}")
+        rng.shuffle(items)
+        passports.append("".join(it + rng.choice(" \n") for it in items).strip())
+    return "\n\n".join(passports)
+
+
+MAX_DAY5_SIZE = 1022
+ROW_CODE = str.maketrans("01", "FB")
+COL_CODE = str.maketrans("01", "LR")
+
+
+def day5(size: int, rng: random.Random) -> str:
+    """Boarding passes for ``size`` consecutive seats with one missing in the middle. The
+    ``size + 1`` seats span IDs 1 to 1023 at most, so ``size`` is between 2 and 1022."""
+    if not 2 <= size <= MAX_DAY5_SIZE:
+        raise ValueError(f"day 5 inputs have 2 to {MAX_DAY5_SIZE} boarding passes")
+
+    start = rng.randint(1, 1023 - size)
+    missing = rng.randint(start + 1, start + size - 1)
+    seats = [s for s in range(start, start + size + 1) if s != missing]
+    rng.shuffle(seats)
+    return "\n".join(
+        f"{seat >> 3:07b}".translate(ROW_CODE) + f"{seat & 7:03b}".translate(COL_CODE)
+        for seat in seats
+    )
+
+
+def day6(size: int, rng: random.Random) -> str:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    groups = []
+    for _ in range(size):
+        common = rng.sample(letters, rng.randint(0, 5))
+        people = []
+        for _ in range(rng.randint(1, 5)):
+            person = set(common) | set(rng.sample(letters, rng.randint(0, 8)))
+            people.append(
+                "".join(rng.sample(sorted(person), len(person))) or rng.choice(letters)
+            )
+        groups.append("\n".join(people))
+    return "\n\n".join(groups)
+
+
+def day7(size: int, rng: random.Random, depth: Optional[int] = None, fanout: int = 4) -> str:
+    """Layered bag graph with ``size`` colours (a DAG of the given depth, by default the square
+    root of ``size``). Each bag contains up to ``fanout`` bags from the next two layers and
+    "shiny gold" sits in the middle layer, so that a growing share of the layers above it hold
+    it and of the layers below it are inside it."""
+    depth = depth or max(8, int(size**0.5))
+    size = max(size, depth)
+    colors = [f"{_word(i // 97)} {_word(i % 97 + 1000)}" for i in range(size)]
+    rng.shuffle(colors)
+    layers = [colors[i::depth] for i in range(depth)]
+    layers[depth // 2][0] = "shiny gold"
+
+    rules = []
+    for i, layer in enumerate(layers):
+        deeper = [c for lyr in layers[i + 1 : i + 3] for c in lyr]
+        for color in layer:
+            children = rng.sample(deeper, min(len(deeper), rng.randint(1, fanout)))
+            # a bag right above "shiny gold" holds it, its holders grow from there
+            if color == layers[depth // 2 - 1][0] and "shiny gold" not in children:
+                children[0] = "shiny gold"
+            if children:
+                content = ", ".join(
+                    f"{n} {c} bag{'s' if n > 1 else ''}"
+                    for n, c in ((rng.randint(1, 5), c) for c in children)
+                )
+            else:
+                content = "no other bags"
+            rules.append(f"{color} bags contain {content}.")
+    rng.shuffle(rules)
+    return "\n".join(rules)
+
+
+def _day8_path(
+    order: List[int], nxt: int, prog: Dict[int, Tuple[str, int]], rng: random.Random
+) -> None:
+    """Fill in the instructions at the addresses of ``order`` so that they run in that order
+    and then go to ``nxt``. The arguments of nops point back to addresses of ``order``."""
+    for i, pos in enumerate(order):
+        target = order[i + 1] if i + 1 < len(order) else nxt
+        if target == pos + 1:
+            op = rng.choice(["acc", "nop"])
+            arg = rng.randint(-99, 99) if op == "acc" else order[rng.randint(0, i)] - pos
+            prog[pos] = (op, arg)
+        else:
+            prog[pos] = ("jmp", target - pos)
+
+
+def day8(size: int, rng: random.Random) -> str:
+    """Program of ``size`` instructions which loops, and terminates after swapping exactly
+    one ``jmp`` or ``nop``, as real puzzle inputs do.
+
+    The looping part runs through every instruction of the first half, whose instructions
+    all lead back into it even when swapped, except for the last one: a ``nop`` which jumps to
+    the second half if swapped. The second half runs through all its instructions, then
+    terminates. The instruction right before the second half is never run and jumps back.
+    """
+    size = max(size, 8)
+    half = size // 2
+
+    prog: Dict[int, Tuple[str, int]] = {}
+    loop = [0] + rng.sample(range(1, half - 1), half - 2)
+    if loop[-1] == half - 2:
+        # the nop would run the instruction before the second half
+        loop[1], loop[-1] = loop[-1], loop[1]
+    _day8_path(loop, loop[-1] + 1, prog, rng)
+    bug = loop[-1]
+    prog[bug] = ("nop", half - bug)
+    prog[half - 1] = ("jmp", rng.choice(loop) - (half - 1))
+
+    tail = [half] + rng.sample(range(half + 1, size), size - half - 1)
+    _day8_path(tail, size, prog, rng)
+    return "\n".join(f"{op} {arg:+d}" for op, arg in (prog[pos] for pos in range(size)))
+
+
+def day9(size: int, rng: random.Random, width: int = 25, bound: int = 10**6) -> str:
+    """XMAS stream of ``size`` numbers with a single fault, which is also the sum of a
+    contiguous run of earlier numbers. Values stay below ``bound`` by keeping zeros in the
+    window, so that the stream can be made arbitrarily long."""
+    size = max(size, width + 20)
+    window = [0, 0] + [rng.randint(1, bound // 4) for _ in range(width - 2)]
+    rng.shuffle(window)
+    numbers = list(window)
+
+    fault_at = rng.randint(width + 10, size - 10)
+    for i in range(width, size):
+        window = numbers[i - width : i]
+        if i >= fault_at and window.count(0) > 2:
+            fault_at = size
+            for run_len in itertools.count(3):
+                start = rng.randint(width, i - run_len)
+                x = sum(numbers[start : start + run_len])
+                if x > 2 * max(window):
+                    break
+        elif window.count(0) <= 2:
+            x = 0
+        else:
+            a, b = rng.sample(window, 2)
+            x = a + b if a + b < bound else a
+        numbers.append(x)
+    return "\n".join(str(n) for n in numbers)
+
+
+def day10(size: int, rng: random.Random) -> str:
+    """Adapters chained by gaps of 1 or 3 jolts, with runs of at most four 1-gaps."""
+    values: List[int] = []
+    joltage = 0
+    while len(values) < size:
+        for _ in range(rng.randint(1, 4)):
+            joltage += 1
+            values.append(joltage)
+        joltage += 3
+        values.append(joltage)
+    values = values[:size]
+    rng.shuffle(values)
+    return "\n".join(str(v) for v in values)
+
+
+DIRECTIONS = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if (di, dj) != (0, 0)]
+
+
+def _seat_neighbors(seats: np.ndarray, line_of_sight: bool) -> np.ndarray:
+    """Flat index of the neighbouring (or first visible) seat of each cell in each direction,
+    -1 if there is none."""
+    h, w = seats.shape
+    out = np.full((len(DIRECTIONS), h * w), -1)
+    for k, (di, dj) in enumerate(DIRECTIONS):
+        for i, j in itertools.product(range(h), range(w)):
+            ii, jj = i + di, j + dj
+            while 0 <= ii < h and 0 <= jj < w:
+                if seats[ii, jj]:
+                    out[k, i * w + j] = ii * w + jj
+                    break
+                if not line_of_sight:
+                    break
+                ii, jj = ii + di, jj + dj
+    return out
+
+
+def _oscillating_seats(seats: np.ndarray, line_of_sight: bool) -> np.ndarray:
+    """Simulate the seating rules and return the seats which never settle."""
+    neighbors = _seat_neighbors(seats, line_of_sight)
+    threshold = 5 if line_of_sight else 4
+    flat_seats = np.append(seats.ravel(), False)
+    occupied = np.zeros_like(flat_seats)
+    previous = None
+    while True:
+        count = occupied[neighbors].sum(axis=0)
+        new = occupied.copy()
+        new[:-1] = flat_seats[:-1] & np.where(occupied[:-1], count < threshold, count == 0)
+        if np.all(new == occupied):
+            return np.zeros_like(seats)
+        if previous is not None and np.all(new == previous):
+            return (new != occupied)[:-1].reshape(seats.shape)
+        previous, occupied = occupied, new
+
+
+def day11(size: int, rng: random.Random, density: float = 0.8) -> str:
+    """Seat layout for which both seating rules settle. Random layouts may contain regions
+    which flip between empty and full forever, such seats are turned into floor."""
+    seats = np.array([[rng.random() < density for _ in range(size)] for _ in range(size)])
+    settled = False
+    while not settled:
+        settled = True
+        for line_of_sight in (False, True):
+            oscillating = _oscillating_seats(seats, line_of_sight)
+            if oscillating.any():
+                settled = False
+                for i, j in np.argwhere(oscillating):
+                    if rng.random() < 0.2:
+                        seats[i, j] = False
+    return "\n".join("".join("L" if c else "." for c in row) for row in seats)
+
+
+def day12(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        op = rng.choice("NSEWFFFLR")
+        param = rng.choice([90, 180, 270]) if op in "LR" else rng.randint(1, 100)
+        lines.append(f"{op}{param}")
+    return "\n".join(lines)
+
+
+def _primes(count: int, start: int) -> List[int]:
+    primes: List[int] = []
+    n = start
+    while len(primes) < count:
+        if all(n % d for d in range(2, int(n**0.5) + 1)):
+            primes.append(n)
+        n += 1
+    return primes
+
+
+def day13(size: int, rng: random.Random) -> str:
+    """Timetable with ``size`` buses, whose IDs are distinct primes."""
+    bus_ids = _primes(size, 13)
+    rng.shuffle(bus_ids)
+    slots = [str(bus_ids[0])]
+    for bus_id in bus_ids[1:]:
+        slots.extend(["x"] * rng.randint(0, 4))
+        slots.append(str(bus_id))
+    return f"{rng.randint(10 ** 5, 10 ** 7)}\n" + ",".join(slots)
+
+
+def day14(size: int, rng: random.Random, max_floating: int = 9) -> str:
+    lines = []
+    for i in range(size):
+        if i % 5 == 0:
+            mask = rng.choices("01", k=36)
+            for idx in rng.sample(range(36), rng.randint(1, max_floating)):
+                mask[idx] = "X"
+            lines.append("mask = " + "".join(mask))
+        lines.append(f"mem[{rng.randint(0, 2 ** 16)}] = {rng.randint(0, 2 ** 30)}")
+    return "\n".join(lines)
+
+
+def day15(size: int, rng: random.Random) -> str:
+    return ",".join(str(n) for n in rng.sample(range(max(size * 3, 20)), size))
+
+
+def day16(size: int, rng: random.Random, fields: int = 20) -> str:
+    """Ticket notes with ``size`` nearby tickets. Field ``r`` accepts values of bands ``r`` and
+    above, so that fields can be matched to columns one by one."""
+    band = 20
+    names = [f"departure {_word(i)}" if i < 6 else f"field {_word(i)}" for i in range(fields)]
+    rng.shuffle(names)
+    end = 100 + band * fields
+
+    rules = []
+    for r, name in enumerate(names):
+        lo = 100 + band * r
+        rules.append(f"{name}: {lo}-{lo + 9} or {lo + 11}-{end}")
+
+    level = list(range(fields))
+    rng.shuffle(level)
+
+    def ticket(invalid: bool) -> str:
+        values = [
+            100 + band * lvl + rng.choice([*range(10), *range(11, band)]) for lvl in level
+        ]
+        if invalid:
+            values[rng.randrange(fields)] = rng.randint(0, 99)
+        return ",".join(str(v) for v in values)
+
+    nearby = [ticket(rng.random() < 0.2) for _ in range(size)]
+    return (
+        "\n".join(rules)
+        + "\n\nyour ticket:\n"
+        + ticket(False)
+        + "\n\nnearby tickets:\n"
+        + "\n".join(nearby)
+    )
+
+
+def day17(size: int, rng: random.Random, density: float = 0.4) -> str:
+    return "\n".join(
+        "".join("#" if rng.random() < density else "." for _ in range(size))
+        for _ in range(size)
+    )
+
+
+def _expr(rng: random.Random, depth: int) -> str:
+    terms = []
+    for _ in range(rng.randint(2, 5)):
+        if depth > 0 and rng.random() < 0.3:
+            terms.append(f"({_expr(rng, depth - 1)})")
+        else:
+            terms.append(str(rng.randint(1, 9)))
+    return "".join(
+        t + (f" {rng.choice('+*')} " if i < len(terms) - 1 else "")
+        for i, t in enumerate(terms)
+    )
+
+
+def day18(size: int, rng: random.Random, depth: int = 3) -> str:
+    return "\n".join(_expr(rng, depth) for _ in range(size))
+
+
+def day19(size: int, rng: random.Random, chunk: int = 6) -> str:
+    """Grammar where rules 42 and 31 each match half of all ``chunk``-long strings, and
+    ``size`` messages built out of such chunks.
+
+    Rules are built as tries branching on the first character, so that the (non-backtracking)
+    matchers of day 19 parse them exactly.
+    """
+    ids = iter(rng.sample(range(100, 100 + 4 * 2**chunk), 4 * 2**chunk))
+    rules: Dict[int, str] = {}
+    lit = {"a": next(ids), "b": next(ids)}
+    rules[lit["a"]], rules[lit["b"]] = '"a"', '"b"'
+
+    def build(strings: Set[str]) -> int:
+        rule_id = next(ids)
+        options = []
+        for c in "ab":
+            tails = {s[1:] for s in strings if s[0] == c}
+            if not tails:
+                continue
+            elif tails == {""}:
+                options.append(str(lit[c]))
+            else:
+                options.append(f"{lit[c]} {build(tails)}")
+        rules[rule_id] = " | ".join(options)
+        return rule_id
+
+    all_strings = ["".join(s) for s in itertools.product("ab", repeat=chunk)]
+    rng.shuffle(all_strings)
+    half = len(all_strings) // 2
+    lang42, lang31 = all_strings[:half], all_strings[half:]
+    rules[42] = f"{build(set(lang42))}"
+    rules[31] = f"{build(set(lang31))}"
+    rules[0], rules[8], rules[11] = "8 11", "42", "42 31"
+
+    messages = []
+    for _ in range(size):
+        n42, n31 = rng.randint(1, 5), rng.randint(0, 4)
+        msg = "".join(rng.choice(lang42) for _ in range(n42))
+        msg += "".join(rng.choice(lang31) for _ in range(n31))
+        if rng.random() < 0.2:
+            msg += rng.choice(all_strings)
+        messages.append(msg)
+
+    rule_lines = [f"{k}: {v}" for k, v in rules.items()]
+    rng.shuffle(rule_lines)
+    return "\n".join(rule_lines) + "\n\n" + "\n".join(messages)
+
+
+MONSTER = ["                  # ", "#    ##    ##    ###", " #  #  #  #  #  #   "]
+
+
+# the 2 * size * (size + 1) tile edges must be drawn among 120 + 120 + 256 edges, depending on
+# their corners, 14 would need luck
+MAX_DAY20_SIZE = 13
+
+
+def day20(size: int, rng: random.Random, monsters: int = 0) -> str:
+    """Mosaic of ``size`` x ``size`` 10x10 tiles, randomly rotated and flipped, with
+    ``monsters`` sea monsters planted in the image (defaults to one per two tiles).
+
+    Tile edges must be unique among 496 possible 10-bit edges (up to reversal), which limits
+    ``size`` to ``MAX_DAY20_SIZE``.
+    """
+    n = size
+    dim = 9 * n + 1
+    grid = np.zeros((dim, dim), dtype=bool)
+
+    # sparse image with planted monsters, then copied into tile interiors
+    img = np.array([[rng.random() < 0.15 for _ in range(8 * n)] for _ in range(8 * n)])
+    monster = np.array([[c == "#" for c in line] for line in MONSTER])
+    for _ in range(monsters or max(n * n // 2, 1)):
+        i = rng.randrange(8 * n - monster.shape[0] - 1)
+        j = rng.randrange(8 * n - monster.shape[1] - 1)
+        img[i : i + monster.shape[0], j : j + monster.shape[1]] |= monster
+    for i, j in itertools.product(range(n), repeat=2):
+        grid[9 * i + 1 : 9 * i + 9, 9 * j + 1 : 9 * j + 9] = img[
+            8 * i : 8 * i + 8, 8 * j : 8 * j + 8
+        ]
+
+    if n > MAX_DAY20_SIZE:
+        raise ValueError(f"too many tiles ({n}x{n}) for unique tile edges")
+
+    def fill(segment: np.ndarray, used: Set[Tuple[bool, ...]]) -> bool:
+        options = []
+        for bits in itertools.product([False, True], repeat=8):
+            edge = (bool(segment[0]), *bits, bool(segment[-1]))
+            if edge != edge[::-1] and edge not in used and edge[::-1] not in used:
+                options.append(edge)
+        if not options:
+            return False
+        edge = rng.choice(options)
+        used.add(edge)
+        segment[:] = edge
+        return True
+
+    # tile borders: lattice points first, then unique segments between them, drawing another
+    # lattice if its corners leave too few edges of some kind
+    while True:
+        for i, j in itertools.product(range(n + 1), repeat=2):
+            grid[9 * i, 9 * j] = rng.random() < 0.5
+        used: Set[Tuple[bool, ...]] = set()
+        if all(
+            fill(grid[9 * i, 9 * j : 9 * j + 10], used)
+            and fill(grid[9 * j : 9 * j + 10, 9 * i], used)
+            for i in range(n + 1)
+            for j in range(n)
+        ):
+            break
+
+    tile_ids = rng.sample(range(1000, 10000), n * n)
+    tiles = []
+    for tile_id, (i, j) in zip(tile_ids, itertools.product(range(n), repeat=2)):
+        tile = np.rot90(grid[9 * i : 9 * i + 10, 9 * j : 9 * j + 10], rng.randrange(4))
+        if rng.random() < 0.5:
+            tile = tile[::-1]
+        lines = ["".join("#" if c else "." for c in row) for row in tile]
+        tiles.append(f"Tile {tile_id}:\n" + "\n".join(lines))
+    rng.shuffle(tiles)
+    return "\n\n".join(tiles)
+
+
+def _day21_solvable(foods: List[Set[str]], allergens: Dict[str, List[int]]) -> bool:
+    candidates = {
+        a: set.intersection(*[foods[i] for i in idx]) for a, idx in allergens.items()
+    }
+    while candidates:
+        resolved = {a: c for a, c in candidates.items() if len(c) == 1}
+        if not resolved:
+            return False
+        for a, c in resolved.items():
+            del candidates[a]
+            for other in candidates.values():
+                other -= c
+    return True
+
+
+def day21(size: int, rng: random.Random, allergen_count: int = 8) -> str:
+    """``size`` food labels, each allergen being contained in exactly one ingredient."""
+    allergen_names = [_word(i + 500) for i in range(allergen_count)]
+    safe = [_word(i + 2000) for i in range(max(size, 20))]
+    carriers = dict(zip(allergen_names, (_word(i + 1000) for i in range(allergen_count))))
+
+    while True:
+        lines = []
+        foods: List[Set[str]] = []
+        listed: Dict[str, List[int]] = {}
+        for i in range(max(size, allergen_count * 3)):
+            contained = rng.sample(allergen_names, rng.randint(1, min(4, allergen_count)))
+            shown = rng.sample(contained, rng.randint(1, len(contained)))
+            ingredients = {carriers[a] for a in contained} | set(rng.sample(safe, 8))
+            foods.append(ingredients)
+            for a in shown:
+                listed.setdefault(a, []).append(i)
+            lines.append(
+                " ".join(rng.sample(sorted(ingredients), len(ingredients)))
+                + f" (contains {', '.join(shown)})"
+            )
+        if len(listed) == allergen_count and _day21_solvable(foods, listed):
+            return "\n".join(lines)
+
+
+def day22(size: int, rng: random.Random) -> str:
+    """Two decks of ``size`` distinct cards each."""
+    cards = rng.sample(range(1, 2 * size + 1), 2 * size)
+    return (
+        "Player 1:\n"
+        + "\n".join(str(c) for c in cards[:size])
+        + "\n\nPlayer 2:\n"
+        + "\n".join(str(c) for c in cards[size:])
+    )
+
+
+GENERATORS: Dict[int, Callable[..., str]] = {
+    1: day1,
+    2: day2,
+    3: day3,
+    4: day4,
+    5: day5,
+    6: day6,
+    7: day7,
+    8: day8,
+    9: day9,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+    17: day17,
+    18: day18,
+    19: day19,
+    20: day20,
+    21: day21,
+    22: day22,
+}
+
+
+def generate(day: int, size: int, seed: int = 0, **kwargs) -> str:
+    """Generate a valid input of the given size for a day."""
+    return GENERATORS[day](size, random.Random(f"{day}:{size}:{seed}"), **kwargs)
+
+
+# sizes small enough for the solvers to run in the test suite
+TEST_SIZES = {5: 100, 11: 12, 13: 6, 15: 4, 17: 4, 20: 3, 22: 10}
+
+
+def test_generate_is_deterministic():
+    for day in GENERATORS:
+        size = TEST_SIZES.get(day, 50)
+        assert generate(day, size, 1) == generate(day, size, 1)
+        assert not generate(day, size, 1).endswith("\n")
+
+
+def test_generated_inputs_are_solvable():
+    from aoc2020 import runner
+
+    for day in GENERATORS:
+        data = generate(day, TEST_SIZES.get(day, 50))
+        parts = [1] if day == 15 else [1, 2]
+        for part in parts:
+            res = runner.solve_part(day, part, data)
+            assert res.error is None, f"day {day} part {part}: {res.error}"
+
+
+def test_known_answers():
+    from aoc2020 import day1, day5, day7, day8, day9
+
+    entries = [int(s) for s in generate(1, 100).split("\n")]
+    assert day1.solve_day1(entries) is not None
+    assert day1.solve_day1_part2(entries) is not None
+
+    seats = sorted(day5.seat_id(s) for s in generate(5, 500).split("\n"))
+    assert len(seats) == 500
+    assert day5.day5_part2(generate(5, 500)) not in seats
+
+    holders = [day7.day7_part1(generate(7, size)) for size in (100, 1000, 10000)]
+    assert holders[0] < holders[1] < holders[2] and holders[2] > 1000
+    assert day7.day7_part2(generate(7, 1000)) > 0
+
+    for seed in range(5):
+        assert len(day8.repairs(day8.parse_program(generate(8, 300, seed)))) == 1
+
+    numbers = [int(s) for s in generate(9, 2000).split("\n")]
+    fault = day9.find_fault(numbers, 25)
+    assert day9.find_weakness(numbers, fault) > 0
@@ -0,0 +1,180 @@
+"""Offline, content-addressed store for puzzle inputs.
+
+Inputs are stored once on disk as ``objects/<sha256>`` and referenced by
+``refs/<year>/<user>/day<day>``. Lookups never touch the network when the input is already in
+the store. Missing inputs are fetched with ``aocd`` unless ``AOC2020_OFFLINE`` is set.
+
+The store location defaults to ``~/.cache/aoc2020/inputs`` and can be overridden with the
+``AOC2020_INPUT_STORE`` environment variable. The user key defaults to ``AOC2020_USER``, then
+to the id of the owner of aocd's session token as memoized by aocd, so that inputs fetched with
+different tokens are kept apart, and to ``"default"``. Lookups fall back to ``"default"`` when
+the input is not stored under the token's owner. With ``AOC2020_OFFLINE`` the token is ignored.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import tempfile
+from typing import Optional, Union
+
+YEAR = 2020
+
+
+class MissingInputError(LookupError):
+    pass
+
+
+def store_dir() -> pathlib.Path:
+    path = os.environ.get("AOC2020_INPUT_STORE")
+    if path:
+        return pathlib.Path(path)
+    return pathlib.Path.home() / ".cache" / "aoc2020" / "inputs"
+
+
+def _aocd_config_dir() -> pathlib.Path:
+    data_dir = os.environ.get("AOCD_DIR", "~/.config/aocd")
+    return pathlib.Path(os.environ.get("AOCD_CONFIG_DIR", data_dir)).expanduser()
+
+
+def _token_user() -> Optional[str]:
+    """The id of the owner of aocd's session token, or ``None`` if it is not known yet.
+
+    Only aocd's memo of token ids is read, the id is never looked up over the network.
+    """
+    if os.environ.get("AOC2020_OFFLINE"):
+        return None
+
+    config = _aocd_config_dir()
+    token = os.environ.get("AOC_SESSION")
+    try:
+        if not token:
+            token = (config / "token").read_text().split()[0]
+        memo = json.loads((config / "token2id.json").read_text())
+    except (OSError, IndexError, ValueError):
+        return None
+    return memo.get(token)
+
+
+def _user(user: Optional[str]) -> str:
+    return user or os.environ.get("AOC2020_USER") or _token_user() or "default"
+
+
+def _ref_path(day: int, year: int, user: Optional[str]) -> pathlib.Path:
+    return store_dir() / "refs" / str(year) / _user(user) / f"day{day}"
+
+
+def _write_atomic(path: pathlib.Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, "wb") as fp:
+        fp.write(content)
+    os.replace(tmp, path)
+
+
+def put_data(
+    data: Union[str, bytes], day: int, year: int = YEAR, user: Optional[str] = None
+) -> str:
+    """Add an input to the store and return its digest."""
+    if isinstance(data, str):
+        data = data.encode()
+
+    digest = hashlib.sha256(data).hexdigest()
+    obj_path = store_dir() / "objects" / digest
+    if not obj_path.exists():
+        _write_atomic(obj_path, data)
+    _write_atomic(_ref_path(day, year, user), digest.encode())
+    return digest
+
+
+def _fetch(day: int, year: int, user: Optional[str]) -> str:
+    if os.environ.get("AOC2020_OFFLINE"):
+        raise MissingInputError(
+            f"input for day {day} ({year}, user {_user(user)}) is not in the store at "
+            f"{store_dir()} and AOC2020_OFFLINE is set"
+        )
+
+    import aocd
+
+    data = aocd.get_data(day=day, year=year)
+    return put_data(data, day, year, user)
+
+
+def digest(day: int, year: int = YEAR, user: Optional[str] = None) -> str:
+    """Return the digest of an input, fetching it into the store if needed."""
+    ref = _ref_path(day, year, user)
+    if not ref.exists() and not user and not os.environ.get("AOC2020_USER"):
+        # inputs stored without a user, before the token's owner was known
+        ref = _ref_path(day, year, "default")
+    if ref.exists():
+        return ref.read_text().strip()
+    return _fetch(day, year, user)
+
+
+def data_path(day: int, year: int = YEAR, user: Optional[str] = None) -> pathlib.Path:
+    """Return the path of an input's file in the store, fetching it if needed."""
+    return store_dir() / "objects" / digest(day, year, user)
+
+
+def get_data(day: int, year: int = YEAR, user: Optional[str] = None) -> str:
+    """Drop-in replacement for ``aocd.get_data()`` backed by the store."""
+    return data_path(day, year, user).read_text()
+
+
+def open_mapped(day: int, year: int = YEAR, user: Optional[str] = None) -> mmap.mmap:
+    """Memory-map an input read-only, for inputs too large to load as a string."""
+    with open(data_path(day, year, user), "rb") as fp:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def test_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC2020_INPUT_STORE", str(tmp_path))
+    monkeypatch.setenv("AOC2020_OFFLINE", "1")
+
+    key = put_data("1\n2\n3", 1, user="alice")
+    assert key == put_data(b"1\n2\n3", 1, user="bob")
+    assert len(list((tmp_path / "objects").iterdir())) == 1
+
+    assert get_data(1, user="alice") == "1\n2\n3"
+    monkeypatch.setenv("AOC2020_USER", "bob")
+    assert digest(1) == key
+    assert digest(1, user="bob") == key
+    with open_mapped(1, user="alice") as mm:
+        assert mm[:3] == b"1\n2"
+
+    import pytest
+
+    with pytest.raises(MissingInputError):
+        get_data(2, user="alice")
+
+
+def test_token_user(tmp_path, monkeypatch):
+    import socket
+
+    import pytest
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("the network was used")
+
+    monkeypatch.setattr(socket, "create_connection", no_network)
+    monkeypatch.setattr(socket.socket, "connect", no_network)
+    monkeypatch.setenv("AOC2020_INPUT_STORE", str(tmp_path / "store"))
+    monkeypatch.setenv("AOCD_CONFIG_DIR", str(tmp_path / "aocd"))
+    monkeypatch.setenv("AOC_SESSION", "deadbeef")
+    monkeypatch.delenv("AOC2020_USER", raising=False)
+    monkeypatch.delenv("AOC2020_OFFLINE", raising=False)
+
+    assert _user(None) == "default"
+    put_data("1\n2", 1)
+    (tmp_path / "aocd").mkdir()
+    (tmp_path / "aocd" / "token2id.json").write_text('{"deadbeef": "alice.github.1"}')
+    assert _user(None) == "alice.github.1"
+    put_data("3\n4", 2)
+    assert (tmp_path / "store" / "refs" / "2020" / "alice.github.1" / "day2").exists()
+    assert get_data(1) == "1\n2"
+
+    monkeypatch.setenv("AOC2020_OFFLINE", "1")
+    assert get_data(1) == "1\n2"
+    with pytest.raises(MissingInputError):
+        get_data(2)
@@ -0,0 +1,201 @@
+"""Opt-in instrumentation of the solvers.
+
+Functions decorated with ``instrument`` record their call count and cumulative time when the
+``AOC2020_INSTRUMENT`` environment variable is set (``python -m aoc2020 run --instrument``
+sets it for the workers). Its value is a comma separated list of modes:
+
+- ``time``: call counts and cumulative time of the instrumented functions
+- ``cprofile``: also profile each solve with cProfile and keep the top functions
+- ``tracemalloc``: also trace allocations and keep the peak and top allocation sites
+
+The variable is read when a function is decorated. When it is unset ``instrument`` returns the
+function itself, so instrumentation costs nothing.
+
+``session`` wraps one solve and writes its report to ``<dir>/day<day>_part<part>.json``, where
+the directory defaults to ``.aoc2020-instrument`` and can be set with
+``AOC2020_INSTRUMENT_DIR``. ``aggregate`` merges these reports.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set
+
+MODES = ("time", "cprofile", "tracemalloc")
+TOP_N = 20
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    total_time: float = 0.0
+    # set while a call is in progress, recursive calls are counted but not timed twice
+    depth: int = 0
+
+
+STATS: Dict[str, CallStats] = {}
+
+
+def modes() -> Set[str]:
+    value = os.environ.get("AOC2020_INSTRUMENT", "")
+    enabled = {mode.strip().lower() for mode in value.split(",") if mode.strip()}
+    if enabled - {"0"}:
+        enabled.add("time")
+    unknown = enabled - set(MODES) - {"0", "1"}
+    if unknown:
+        raise ValueError(f"unknown instrumentation mode(s) {sorted(unknown)}")
+    return enabled & set(MODES)
+
+
+def report_dir() -> pathlib.Path:
+    return pathlib.Path(os.environ.get("AOC2020_INSTRUMENT_DIR", ".aoc2020-instrument"))
+
+
+def instrument(func: Callable, name: Optional[str] = None) -> Callable:
+    """Record the call count and cumulative time of ``func`` if instrumentation is enabled.
+
+    The stats are reported under ``name``, which defaults to the qualified name of ``func``.
+    """
+    if not modes():
+        return func
+
+    name = name or f"{func.__module__}.{func.__qualname__}"
+    stats = STATS.setdefault(name, CallStats())
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats.calls += 1
+        if stats.depth:
+            return func(*args, **kwargs)
+
+        stats.depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.total_time += time.perf_counter() - start
+            stats.depth -= 1
+
+    return wrapper
+
+
+def _profile_report(profile: Any) -> List[Dict[str, Any]]:
+    import pstats
+
+    entries = []
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    for (filename, line, funcname), stat in stats.items():
+        _, ncalls, tottime, cumtime, _ = stat
+        entries.append(
+            {
+                "function": f"{filename}:{line}({funcname})",
+                "calls": ncalls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+        )
+    entries.sort(key=lambda entry: entry["cumtime"], reverse=True)
+    return entries[:TOP_N]
+
+
+@contextlib.contextmanager
+def session(day: int, part: int) -> Iterator[Optional[Dict[str, Any]]]:
+    """Instrument a single solve and write its report, yields ``None`` when disabled.
+
+    The yielded report is filled in when the block exits.
+    """
+    enabled = modes()
+    if not enabled:
+        yield None
+        return
+
+    for stats in STATS.values():
+        stats.calls = 0
+        stats.total_time = 0.0
+
+    report: Dict[str, Any] = {"day": day, "part": part}
+    profile = None
+    if "cprofile" in enabled:
+        import cProfile
+
+        profile = cProfile.Profile()
+    if "tracemalloc" in enabled:
+        import tracemalloc
+
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield report
+    finally:
+        if profile is not None:
+            profile.disable()
+        report["wall_time"] = time.perf_counter() - start
+        report["functions"] = {
+            name: {"calls": stats.calls, "total_time": stats.total_time}
+            for name, stats in STATS.items()
+            if stats.calls
+        }
+        if profile is not None:
+            report["cprofile"] = _profile_report(profile)
+        if "tracemalloc" in enabled:
+            snapshot = tracemalloc.take_snapshot()
+            report["tracemalloc"] = {
+                "peak": tracemalloc.get_traced_memory()[1],
+                "top": [
+                    {"site": str(stat.traceback), "size": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:TOP_N]
+                ],
+            }
+            tracemalloc.stop()
+
+        path = report_dir() / f"day{day}_part{part}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+
+
+def aggregate(paths: Sequence[pathlib.Path]) -> Dict[str, Dict[str, Any]]:
+    """Merge the per-function statistics of several reports."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        report = json.loads(pathlib.Path(path).read_text())
+        for name, stats in report["functions"].items():
+            total = totals.setdefault(name, {"calls": 0, "total_time": 0.0})
+            total["calls"] += stats["calls"]
+            total["total_time"] += stats["total_time"]
+    return totals
+
+
+def format_aggregate(totals: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'calls':>10} {'time (s)':>9}  function"]
+    for name, stats in sorted(totals.items(), key=lambda item: -item[1]["total_time"]):
+        lines.append(f"{stats['calls']:>10} {stats['total_time']:>9.3f}  {name}")
+    return "\n".join(lines)
+
+
+def test_instrument(tmp_path, monkeypatch):
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    monkeypatch.delenv("AOC2020_INSTRUMENT", raising=False)
+    assert instrument(fib) is fib
+
+    monkeypatch.setenv("AOC2020_INSTRUMENT", "cprofile,tracemalloc")
+    monkeypatch.setenv("AOC2020_INSTRUMENT_DIR", str(tmp_path))
+    fib = instrument(fib)
+    with session(1, 2) as report:
+        assert fib(10) == 55
+
+    stats = report["functions"][f"{__name__}.test_instrument.<locals>.fib"]
+    assert stats["calls"] == 177
+    assert 0 < stats["total_time"] <= report["wall_time"]
+    assert report["cprofile"] and report["tracemalloc"]["top"]
+
+    totals = aggregate([tmp_path / "day1_part2.json"] * 2)
+    assert totals[f"{__name__}.test_instrument.<locals>.fib"]["calls"] == 354
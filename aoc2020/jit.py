@@ -0,0 +1,47 @@
+"""Lazily compiled numba functions.
+
+Importing numba takes a significant fraction of the run time of the fast days, so functions
+decorated with ``njit`` from this module are only compiled (and numba only imported) the first
+time they are called.
+"""
+
+from typing import Any, Callable
+
+
+class LazyJit:
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._dispatcher = None
+
+    def dispatcher(self) -> Any:
+        if self._dispatcher is None:
+            import numba
+
+            # numba resolves the functions called by this one through the module's globals, so
+            # these must be replaced by their compiled version first
+            module_globals = self.func.__globals__
+            for name in self.func.__code__.co_names:
+                dep = module_globals.get(name)
+                if isinstance(dep, LazyJit):
+                    module_globals[name] = dep.dispatcher()
+
+            self._dispatcher = numba.njit(*self.args, **self.kwargs)(self.func)
+            module_globals[self.func.__name__] = self._dispatcher
+        return self._dispatcher
+
+    @property
+    def py_func(self) -> Callable:
+        """The original Python function, like ``py_func`` of numba's dispatchers."""
+        return self.func
+
+    def __call__(self, *args, **kwargs):
+        return self.dispatcher()(*args, **kwargs)
+
+
+def njit(*args, **kwargs):
+    """Drop-in replacement for ``numba.njit`` which defers compilation to the first call."""
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return LazyJit(args[0], (), {})
+    return lambda func: LazyJit(func, args, kwargs)
@@ -0,0 +1,24 @@
+"""Helpers for process pools, kept free of the runner so that solvers can use them."""
+
+import collections
+import concurrent.futures
+from typing import Any, Callable, Deque, Iterable, Iterator
+
+
+def bounded_map(
+    pool: concurrent.futures.Executor,
+    func: Callable,
+    items: Iterable[Any],
+    max_in_flight: int,
+    *args: Any,
+) -> Iterator[Any]:
+    """Like ``pool.map(func, items, *args)`` but consumes ``items`` lazily, keeping at most
+    ``max_in_flight`` of them submitted at a time."""
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+    for item in items:
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+        pending.append(pool.submit(func, item, *args))
+
+    while pending:
+        yield pending.popleft().result()
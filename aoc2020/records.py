@@ -0,0 +1,101 @@
+"""Streaming reader for inputs made of records separated by blank lines.
+
+``iter_records`` yields the records of a string, a bytes-like buffer (such as the memory map
+returned by ``inputs.open_mapped``) or a file opened in text or binary mode, one at a time and
+without loading the whole input. The solvers of days 4, 6, 16, 19, 20 and 22 take either a
+whole input or such an iterable of records, e.g.::
+
+    with open("input.txt", "rb") as fp:
+        day6.day6_part1(iter_records(fp))
+"""
+
+import codecs
+import mmap
+from typing import IO, Iterable, Iterator, List, Union
+
+Source = Union[str, bytes, bytearray, mmap.mmap, IO]
+Records = Union[str, Iterable[str]]
+
+CHUNK_SIZE = 1 << 20
+
+
+def _split(buf, sep, end: int) -> Iterator:
+    """Lazily split ``buf[:end]`` on ``sep``."""
+    start = 0
+    while True:
+        stop = buf.find(sep, start, end)
+        if stop == -1:
+            yield buf[start:end]
+            return
+        yield buf[start:stop]
+        start = stop + len(sep)
+
+
+def _stripped_end(buf, newline) -> int:
+    end = len(buf)
+    while end and buf[end - 1 : end] == newline:
+        end -= 1
+    return end
+
+
+def iter_records(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield the records of an input, like ``data.rstrip("\n").split("\n\n")`` does."""
+    if isinstance(source, str):
+        yield from _split(source, "\n\n", _stripped_end(source, "\n"))
+        return
+
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        for raw in _split(source, b"\n\n", _stripped_end(source, b"\n")):
+            yield raw.decode()
+        return
+
+    # the newlines at the end of the text read so far are held back until more text follows,
+    # as they may be separators or trailing newlines
+    pending: List[str] = []
+    held = ""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        text = held + (decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        end = _stripped_end(text, "\n")
+        held = text[end:]
+
+        first, *complete = _split(text, "\n\n", end)
+        if complete:
+            yield "".join(pending) + first
+            yield from complete[:-1]
+            pending = []
+            first = complete[-1]
+        pending.append(first)
+
+    decoder.decode(b"", final=True)
+    yield "".join(pending)
+
+
+def records(data: Records) -> Iterable[str]:
+    """The records of ``data``, either a whole input or already an iterable of its records."""
+    return iter_records(data) if isinstance(data, str) else data
+
+
+def test_iter_records(tmp_path):
+    import io
+
+    data = "a b\nc\n\nd\n\n\ne f é\n"
+    expected = data.rstrip("\n").split("\n\n")
+    assert list(iter_records(data)) == expected
+    assert list(iter_records(data.encode())) == expected
+    for size in (1, 2, 3, 100):
+        assert list(iter_records(io.StringIO(data), size)) == expected
+        assert list(iter_records(io.BytesIO(data.encode()), size)) == expected
+
+    path = tmp_path / "input.txt"
+    path.write_bytes(data.encode())
+    with open(path, "rb") as fp:
+        assert list(iter_records(fp, 4)) == expected
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        assert list(iter_records(buf)) == expected
+
+    assert list(records(["x", "y"])) == ["x", "y"]
+    assert list(records("x\n\ny")) == ["x", "y"]
@@ -0,0 +1,270 @@
+import importlib
+import json
+import math
+import multiprocessing
+import pathlib
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from aoc2020 import cache, inputs, instrument
+
+Solver = Callable[[ModuleType, str], Any]
+
+
+def _ints(data: str) -> List[int]:
+    return [int(item) for item in data.split("\n")]
+
+
+def _day9_part2(m: ModuleType, data: str) -> int:
+    numbers = _ints(data)
+    return m.find_weakness(numbers, m.find_fault(numbers, 25))
+
+
+# Each entry maps a day to its (part 1, part 2) solvers. A solver takes the day's module and
+# the raw puzzle input, so that modules are only imported by the process which runs them.
+SOLVERS: Dict[int, Tuple[Solver, Solver]] = {
+    1: (
+        lambda m, d: m.solve_day1(_ints(d)),
+        lambda m, d: m.solve_day1_part2(_ints(d)),
+    ),
+    2: (lambda m, d: m.count_valid(d)[0], lambda m, d: m.count_valid(d)[1]),
+    3: (
+        lambda m, d: m.solve_day3(m.parse(d)),
+        lambda m, d: m.solve_day3_part2(m.parse(d)),
+    ),
+    4: (lambda m, d: m.day4_part1(d), lambda m, d: m.day4_part2_count_valid(d)),
+    5: (lambda m, d: m.day5(d)[0], lambda m, d: m.day5(d)[1]),
+    6: (lambda m, d: m.day6(d)[0], lambda m, d: m.day6(d)[1]),
+    7: (lambda m, d: m.day7_part1(d), lambda m, d: m.day7_part2(d)),
+    8: (
+        lambda m, d: m.run(m.parse_program(d))[0],
+        lambda m, d: m.correct_and_run(m.parse_program(d)),
+    ),
+    9: (lambda m, d: m.find_fault(_ints(d), 25), _day9_part2),
+    10: (lambda m, d: m.day10_part1(_ints(d)), lambda m, d: m.day10_part2(_ints(d))),
+    11: (
+        lambda m, d: m.day11_part1(m.parse(d)),
+        lambda m, d: m.day11_part2(m.parse(d)),
+    ),
+    12: (lambda m, d: m.day12_part1(d), lambda m, d: m.day12_part2(d)),
+    13: (lambda m, d: m.day13_part1(d), lambda m, d: m.day13_part2_v5(d.split("\n")[1])),
+    14: (lambda m, d: m.day14_part1(d), lambda m, d: m.day14_part2(d)),
+    15: (lambda m, d: m.day15_part1(d, 2020), lambda m, d: m.day15_part1(d, 30000000)),
+    16: (lambda m, d: m.day16_part1(d), lambda m, d: m.day16_part2(d)),
+    17: (lambda m, d: m.day17(d, 6, 3), lambda m, d: m.day17(d, 6, 4)),
+    18: (
+        lambda m, d: m.day18(d, m.simple_expr),
+        lambda m, d: m.day18(d, m.simple_expr_v2),
+    ),
+    19: (lambda m, d: m.day19_part1(d), lambda m, d: m.day19_part2(d)),
+    20: (
+        lambda m, d: m.day20_part1(d),
+        lambda m, d: m.day20_part2(d, round(math.sqrt(d.count("Tile")))),
+    ),
+    21: (
+        lambda m, d: m.day21_part1(*m.parse(d)),
+        lambda m, d: m.day21_part2(*m.parse(d)),
+    ),
+    22: (lambda m, d: m.day22_part1(d), lambda m, d: m.day22_part2(d)),
+}
+
+
+# Importing a day's module must stay cheap, heavy dependencies are imported when needed.
+IMPORT_TIME_BUDGET = 0.75
+HEAVY_MODULES = ("aocd", "numba", "scipy", "sympy")
+
+
+@dataclass
+class PartResult:
+    day: int
+    part: int
+    answer: Optional[str]
+    wall_time: float
+    cpu_time: float
+    max_rss: int
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def parse_days(spec: str) -> List[int]:
+    """Parse a day specification such as ``1-5,7,10-12``."""
+    days: Set[int] = set()
+    for item in spec.split(","):
+        lo, _, hi = item.strip().partition("-")
+        days.update(range(int(lo), int(hi or lo) + 1))
+
+    unknown = days - set(SOLVERS)
+    if unknown:
+        raise ValueError(f"no solver for day(s) {sorted(unknown)}")
+    return sorted(days)
+
+
+def test_parse_days():
+    assert parse_days("1-3") == [1, 2, 3]
+    assert parse_days("7, 2,4-5") == [2, 4, 5, 7]
+    assert parse_days("15") == [15]
+
+
+def solver_variant(solver: Solver) -> str:
+    """Name a solver after the functions it calls and its constants, for the result cache."""
+    code = solver.__code__
+    consts = [c for c in code.co_consts if not hasattr(c, "co_code") and c is not None]
+    return ".".join(code.co_names) + (repr(consts) if consts else "")
+
+
+def test_solver_variant():
+    assert solver_variant(SOLVERS[13][1]) == "day13_part2_v5.split['\\n', 1]"
+    assert solver_variant(SOLVERS[15][0]) != solver_variant(SOLVERS[15][1])
+
+
+def max_rss() -> int:
+    """Peak resident set size of the current process in KiB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def solve_part(
+    day: int, part: int, data: Optional[str] = None, use_cache: bool = False
+) -> PartResult:
+    """Solve one part of one day in the current process and measure it.
+
+    The measured time includes importing the day's module but not fetching its input. With
+    ``use_cache`` the answer is looked up in the result cache first, and stored there, unless
+    the solvers are instrumented.
+    """
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    cached = False
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        if data is None:
+            data = inputs.get_data(day)
+            start_wall = time.perf_counter()
+            start_cpu = time.process_time()
+
+        module = importlib.import_module(f"aoc2020.day{day}")
+        solver = SOLVERS[day][part - 1]
+        use_cache = use_cache and not instrument.modes()
+        if use_cache:
+            answer = cache.get(day, part, solver_variant(solver), data, module.VERSION)
+            cached = answer is not None
+        if answer is None:
+            # every day reports its solver, whatever functions of its module are instrumented
+            solve = instrument.instrument(solver, f"aoc2020.day{day}.part{part}")
+            with instrument.session(day, part):
+                answer = str(solve(module, data))
+            if use_cache:
+                cache.put(day, part, solver_variant(solver), data, module.VERSION, answer)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+
+    return PartResult(
+        day=day,
+        part=part,
+        answer=answer,
+        wall_time=time.perf_counter() - start_wall,
+        cpu_time=time.process_time() - start_cpu,
+        max_rss=max_rss(),
+        error=error,
+        cached=cached,
+    )
+
+
+def _solve_task(task: Tuple[int, int, bool]) -> PartResult:
+    day, part, use_cache = task
+    return solve_part(day, part, use_cache=use_cache)
+
+
+def run_days(
+    days: Sequence[int], jobs: Optional[int] = None, use_cache: bool = False
+) -> List[PartResult]:
+    """Solve both parts of the given days in a process pool.
+
+    Each worker process is used for a single part so that its peak RSS is attributable to
+    that part only.
+    """
+    tasks = [(day, part, use_cache) for day in days for part in (1, 2)]
+    with multiprocessing.Pool(jobs, maxtasksperchild=1) as pool:
+        results = pool.map(_solve_task, tasks, chunksize=1)
+    return results
+
+
+def format_table(results: Sequence[PartResult]) -> str:
+    lines = [f"{'day':>3} {'part':>4} {'wall (s)':>9} {'cpu (s)':>9} {'rss (MiB)':>9}  answer"]
+    for res in results:
+        answer = res.answer if res.error is None else f"ERROR: {res.error}"
+        if res.cached:
+            answer = f"{answer} (cached)"
+        lines.append(
+            f"{res.day:>3} {res.part:>4} {res.wall_time:>9.3f} {res.cpu_time:>9.3f} "
+            f"{res.max_rss / 1024:>9.1f}  {answer}"
+        )
+    return "\n".join(lines)
+
+
+def format_json(results: Sequence[PartResult], wall_time: float) -> str:
+    return json.dumps(
+        {"wall_time": wall_time, "results": [asdict(res) for res in results]}, indent=2
+    )
+
+
+def test_format():
+    results = [
+        PartResult(1, 1, "514579", 0.01, 0.01, 20480),
+        PartResult(1, 2, None, 0.5, 0.4, 30720, "ValueError: oops"),
+    ]
+    table = format_table(results).splitlines()
+    assert len(table) == 3
+    assert table[1].endswith("514579")
+    assert table[2].endswith("ERROR: ValueError: oops")
+    assert json.loads(format_json(results, 1.0))["results"][1]["max_rss"] == 30720
+
+
+def test_solve_part(tmp_path, monkeypatch):
+    res = solve_part(1, 1, "1721\n979\n366\n299\n675\n1456")
+    assert res.answer == "514579"
+    assert res.error is None
+    assert res.max_rss > 0
+
+    monkeypatch.setenv("AOC2020_RESULT_CACHE", str(tmp_path / "results.sqlite"))
+    res = solve_part(1, 1, "1721\n979\n366\n299\n675\n1456", use_cache=True)
+    assert not res.cached
+    res = solve_part(1, 1, "1721\n979\n366\n299\n675\n1456", use_cache=True)
+    assert res.cached and res.answer == "514579"
+
+    res = solve_part(1, 1, "not a number")
+    assert res.answer is None
+    assert res.error.startswith("ValueError")
+
+    monkeypatch.setenv("AOC2020_INSTRUMENT", "time")
+    monkeypatch.setenv("AOC2020_INSTRUMENT_DIR", str(tmp_path))
+    solve_part(1, 2, "1721\n979\n366\n299\n675\n1456")
+    report = json.loads((tmp_path / "day1_part2.json").read_text())
+    assert report["functions"]["aoc2020.day1.part2"]["calls"] == 1
+
+
+def test_import_budget():
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import aoc2020.day{day}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps([elapsed, [m for m in {heavy} if m in sys.modules]]))"
+    )
+    for day in SOLVERS:
+        proc = subprocess.run(
+            [sys.executable, "-c", code.format(day=day, heavy=HEAVY_MODULES)],
+            cwd=pathlib.Path(__file__).parents[1],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        elapsed, heavy = json.loads(proc.stdout)
+        assert heavy == [], f"day {day} imports {heavy}"
+        assert elapsed < IMPORT_TIME_BUDGET, f"day {day} takes {elapsed:.3f}s to import"
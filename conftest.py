@@ -0,0 +1,18 @@
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+
+def pytest_addoption(parser):
+    parser.addini(
+        "benchmark_compare_fail",
+        "regression thresholds applied when comparing benchmarks to a saved baseline",
+        type="args",
+    )
+
+
+# before pytest-benchmark reads its options
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption("benchmark_compare") and not config.option.benchmark_compare_fail:
+        thresholds = config.getini("benchmark_compare_fail")
+        config.option.benchmark_compare_fail = [parse_compare_fail(t) for t in thresholds]